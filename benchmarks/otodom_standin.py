@@ -0,0 +1,400 @@
+"""Local otodom.pl stand-in serving search and detail pages for offline scraper tests
+
+Pages use the URL layout of PropertySearchQuery.get_url and the markup read by
+PropertyScraper and PropertyParser. Pages recorded in a PageArchive are served
+as they were fetched, every other listing is generated from a seed.
+
+Run from the repository root:  python -m benchmarks.otodom_standin
+"""
+
+import logging
+import random
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from src.geo.gazetteer import DEFAULT_GAZETTEER
+from src.models.types import DISTRICT_NAMES, District, ListingType
+from src.scraper.archive import ArchiveEntry, PageArchive
+
+logger = logging.getLogger(__name__)
+
+HOST: str = "127.0.0.1"
+PORT: int = 8765
+
+SEARCH_PATH: str = "/pl/wyniki"
+OFFER_PATH: str = "/pl/oferta"
+
+LISTING_TYPE_CODES: Dict[ListingType, str] = {ListingType.SALE: "S", ListingType.RENT: "R"}
+DISTRICT_LIST: List[District] = list(District)
+
+STREETS: List[str] = [
+    "ul. Marszałkowska", "ul. Puławska", "ul. Grochowska", "ul. Górczewska",
+    "ul. Modlińska", "ul. Połczyńska", "ul. Kondratowicza", "al. Krakowska",
+    "ul. Radzymińska", "ul. Wał Miedzeszyński", "ul. KEN", "ul. Żwirki i Wigury",
+]
+FEATURES: List[str] = [
+    "balkon", "garaż/miejsce parkingowe", "piwnica", "oddzielna kuchnia", "taras",
+    "ogródek", "pom. użytkowe", "tylko dla niepalących", "Wynajmę również studentom",
+]
+
+
+@dataclass
+class StandInConfig:
+    """Traffic shape of the stand-in"""
+
+    listings_per_search: int = 200
+    # Small districts finish early, as on the real site
+    listing_counts: Dict[District, int] = field(
+        default_factory=lambda: {District.REMBERTOW: 30, District.WESOLA: 40}
+    )
+    latency_ms: float = 50.0
+    latency_jitter_ms: float = 20.0
+    # Share of responses delayed by tail_latency_ms instead, shows up in p99
+    tail_rate: float = 0.01
+    tail_latency_ms: float = 1000.0
+    # Share of requests answered with 503
+    error_rate: float = 0.0
+    # Token bucket over all clients, exceeding it returns 429 with Retry-After
+    max_requests_per_second: Optional[float] = None
+    retry_after_seconds: int = 1
+    # Filler in every page, real detail pages carry a few hundred KB of JSON
+    page_padding_kb: int = 100
+    seed: int = 0
+    archive_dir: Optional[str] = None
+
+
+def _listing_id(district: District, listing_type: ListingType, number: int) -> str:
+    return f"{LISTING_TYPE_CODES[listing_type]}{DISTRICT_LIST.index(district):02d}N{number}"
+
+
+def _parse_listing_id(listing_id: str) -> Optional[Tuple[District, ListingType, int]]:
+    listing_types = {code: lt for lt, code in LISTING_TYPE_CODES.items()}
+    try:
+        listing_type = listing_types[listing_id[0]]
+        district = DISTRICT_LIST[int(listing_id[1:3])]
+        number = int(listing_id.split("N", 1)[1])
+    except (KeyError, IndexError, ValueError):
+        return None
+    return district, listing_type, number
+
+
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the scraper's connection pool behaves as against the real site
+    protocol_version = "HTTP/1.1"
+    server: "_StandInHTTPServer"
+
+    def do_GET(self) -> None:
+        status, body, headers = self.server.standin.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format % args)
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Scraper opens many connections at once, the default backlog of 5 refuses some
+    request_queue_size = 256
+    standin: "OtodomStandIn"
+
+
+class OtodomStandIn:
+    """Threaded HTTP server imitating otodom search and detail pages"""
+
+    def __init__(
+        self, config: Optional[StandInConfig] = None, host: str = HOST, port: int = 0
+    ):
+        self.config = config or StandInConfig()
+        self.host = host
+        self.port = port
+        self._server: Optional[_StandInHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._bucket = (
+            _TokenBucket(self.config.max_requests_per_second)
+            if self.config.max_requests_per_second
+            else None
+        )
+        self._statuses: Counter = Counter()
+        self._lock = threading.Lock()
+        # Latency and error draws, the n-th request gets the same draws in every run
+        self._traffic_rng = random.Random(self.config.seed)
+        self._neighborhoods = self._load_neighborhoods()
+        self._recorded = self._load_recorded()
+        self._padding = self._build_padding()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def search_base_url(self) -> str:
+        """Value for PropertySearchQuery.base_url / BatchScraper.search_base_url"""
+        return f"{self.base_url}{SEARCH_PATH}"
+
+    def _load_neighborhoods(self) -> Dict[str, List[str]]:
+        gazetteer = pd.read_csv(DEFAULT_GAZETTEER, encoding="utf-8-sig")
+        neighborhoods = gazetteer[gazetteer["kind"] == "neighborhood"]
+        return neighborhoods.groupby("district")["name"].apply(list).to_dict()
+
+    def _load_recorded(self) -> Dict[str, Tuple[PageArchive, ArchiveEntry]]:
+        """Archived pages by request path (any host), newest fetch of each URL"""
+        if self.config.archive_dir is None:
+            return {}
+
+        archive = PageArchive(self.config.archive_dir)
+        recorded = {}
+        for entry in archive.latest_entries(lambda entry: entry.status == 200):
+            split = urllib.parse.urlsplit(entry.url)
+            path = urllib.parse.urlunsplit(("", "", split.path, split.query, ""))
+            recorded[path] = (archive, entry)
+        logger.info(f"Serving {len(recorded)} recorded pages from {self.config.archive_dir}")
+        return recorded
+
+    def _build_padding(self) -> str:
+        rng = random.Random(self.config.seed)
+        chunk = ",".join(f'"k{i}":{rng.randint(0, 10**6)}' for i in range(64))
+        size = self.config.page_padding_kb * 1024
+        filler = (chunk * (size // len(chunk) + 1))[:size]
+        return f'<script id="__NEXT_DATA__" type="application/json">{{{filler}}}</script>'
+
+    def listing_count(self, district: District) -> int:
+        return self.config.listing_counts.get(district, self.config.listings_per_search)
+
+    def stats(self) -> Dict[int, int]:
+        """Responses sent so far by HTTP status"""
+        with self._lock:
+            return dict(self._statuses)
+
+    def _draw_traffic(self) -> Tuple[float, bool]:
+        """Delay in ms and whether to fail, for the next request"""
+        with self._lock:
+            tail = self._traffic_rng.random() < self.config.tail_rate
+            jitter = self._traffic_rng.uniform(-1, 1)
+            error = self._traffic_rng.random() < self.config.error_rate
+
+        if tail:
+            delay_ms = self.config.tail_latency_ms
+        else:
+            delay_ms = max(0.0, self.config.latency_ms + jitter * self.config.latency_jitter_ms)
+        return delay_ms, error
+
+    def respond(self, request_path: str) -> Tuple[int, bytes, Dict[str, str]]:
+        """Status, body and extra headers for one GET"""
+        status, body, headers = self._route(request_path)
+        with self._lock:
+            self._statuses[status] += 1
+        return status, body, headers
+
+    def _route(self, request_path: str) -> Tuple[int, bytes, Dict[str, str]]:
+        if self._bucket is not None and not self._bucket.take():
+            return 429, b"Too Many Requests", {
+                "Retry-After": str(self.config.retry_after_seconds)
+            }
+
+        delay_ms, error = self._draw_traffic()
+        time.sleep(delay_ms / 1000)
+        if error:
+            return 503, b"Service Unavailable", {}
+
+        recorded = self._recorded.get(request_path)
+        if recorded is not None:
+            archive, entry = recorded
+            return 200, archive.read(entry), {}
+
+        split = urllib.parse.urlsplit(request_path)
+        if split.path.startswith(SEARCH_PATH + "/"):
+            page = self._search_page(split.path, urllib.parse.parse_qs(split.query))
+        elif split.path.startswith(OFFER_PATH + "/"):
+            page = self._detail_page(split.path)
+        else:
+            page = None
+
+        if page is None:
+            return 404, b"Not Found", {}
+        return 200, page.encode("utf-8"), {}
+
+    def _search_page(self, path: str, params: Dict[str, List[str]]) -> Optional[str]:
+        # /pl/wyniki/<listing type>/<property type>/<district path>
+        parts = path[len(SEARCH_PATH) + 1 :].split("/", 2)
+        if len(parts) != 3:
+            return None
+        try:
+            listing_type = ListingType(parts[0])
+            district = District(parts[2])
+        except ValueError:
+            return None
+
+        page = int(params.get("page", ["1"])[0])
+        limit = int(params.get("limit", ["36"])[0])
+        start = (page - 1) * limit
+        stop = min(start + limit, self.listing_count(district))
+
+        cards = "".join(
+            f'<article><a data-cy="listing-item-link" href="{OFFER_PATH}/'
+            f'mieszkanie-{district.name.lower()}-{number}-ID{_listing_id(district, listing_type, number)}">'
+            f"Mieszkanie {number}</a></article>"
+            for number in range(start, stop)
+        )
+        return f"<html><body><main>{cards}</main>{self._padding}</body></html>"
+
+    def _detail_page(self, path: str) -> Optional[str]:
+        _, _, listing_id = path.rpartition("-ID")
+        parsed = _parse_listing_id(listing_id)
+        if parsed is None:
+            return None
+        district, listing_type, number = parsed
+        if number >= self.listing_count(district):
+            return None
+        return _render_detail(
+            self.config.seed, district, listing_type, number,
+            tuple(self._neighborhoods.get(DISTRICT_NAMES[district], [])),
+        ) + self._padding + "</body></html>"
+
+    def start(self) -> "OtodomStandIn":
+        """Serve on a background thread, port 0 picks a free port"""
+        self._server = _StandInHTTPServer((self.host, self.port), _StandInHandler)
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="otodom-standin", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Otodom stand-in listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "OtodomStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _item(label: str, value: Optional[str]) -> str:
+    """One detail row in the AdDetailItem markup PropertyParser looks for"""
+    if value is None:
+        return ""
+    return (
+        '<div data-sentry-element="ItemGridContainer" data-sentry-source-file="AdDetailItem.tsx">'
+        f'<div data-sentry-element="Item" data-sentry-source-file="AdDetailItem.tsx">{label}</div>'
+        f"<div>{value}</div></div>"
+    )
+
+
+@lru_cache(maxsize=4096)
+def _render_detail(
+    seed: int,
+    district: District,
+    listing_type: ListingType,
+    number: int,
+    neighborhoods: Tuple[str, ...],
+) -> str:
+    """Detail page head and body of one synthetic listing, deterministic per seed"""
+    rng = random.Random(f"{seed}-{district.name}-{listing_type.name}-{number}")
+    is_sale = listing_type == ListingType.SALE
+
+    area = round(rng.uniform(22, 110), rng.choice([0, 2]))
+    rooms = max(1, min(5, int(area // 22) + rng.choice([-1, 0, 0, 1])))
+    if is_sale:
+        price = round(area * rng.uniform(11_000, 26_000), -3)
+    else:
+        price = round(area * rng.uniform(50, 95), -1)
+
+    total_floors = rng.randint(2, 12)
+    current_floor = rng.randint(0, total_floors)
+    location_parts = []
+    if rng.random() < 0.8:
+        location_parts.append(rng.choice(STREETS))
+    location_parts += [
+        rng.choice(neighborhoods) if neighborhoods else DISTRICT_NAMES[district],
+        DISTRICT_NAMES[district],
+        "Warszawa",
+        "mazowieckie",
+    ]
+
+    security = rng.sample(["monitoring / ochrona", "teren zamknięty"], rng.randint(0, 2))
+    features = rng.sample(FEATURES, rng.randint(0, 4))
+
+    items = "".join(
+        [
+            _item("Powierzchnia:", f"{area:g}m²"),
+            _item("Liczba pokoi:", str(rooms)),
+            _item("Ogrzewanie:", rng.choice(["miejskie", "gazowe", "elektryczne", "brak informacji"])),
+            _item("Piętro:", f"{current_floor or 'parter'}/{total_floors}"),
+            _item("Czynsz:", f"{rng.randrange(300, 1500, 10)} zł/miesiąc"),
+            _item("Stan wykończenia:", rng.choice(["do zamieszkania", "do wykończenia", "do remontu"])),
+            _item("Rynek:", rng.choice(["pierwotny", "wtórny"]) if is_sale else None),
+            _item("Forma własności:", "pełna własność" if is_sale else None),
+            _item("Typ ogłoszeniodawcy:", rng.choice(["prywatny", "biuro nieruchomości", "deweloper"])),
+            _item("Rok budowy:", str(rng.randint(1950, 2025))),
+            _item("Winda:", rng.choice(["tak", "nie"])),
+            _item("Rodzaj zabudowy:", rng.choice(["blok", "apartamentowiec", "kamienica"])),
+            _item("Okna:", rng.choice(["plastikowe", "drewniane"])),
+            _item("Bezpieczeństwo:", "".join(f"<span>{s}</span>" for s in security) or None),
+            _item(
+                "Informacje dodatkowe:",
+                "".join(f'<span class="css-axw7ok">{f}</span>' for f in features) or None,
+            ),
+        ]
+    )
+
+    price_text = f"{int(price):,}".replace(",", " ")
+    return (
+        "<html><body>"
+        '<strong data-cy="adPageHeaderPrice" data-sentry-element="Price" '
+        f'data-sentry-source-file="AdPrice.tsx">{price_text} zł</strong>'
+        + '<a data-sentry-element="StyledLink" data-sentry-source-file="MapLink.tsx" href="#map">'
+        + ", ".join(location_parts)
+        + "</a>"
+        + items
+    )
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    with OtodomStandIn(port=PORT) as standin:
+        logger.info(f"Search base URL: {standin.search_base_url}, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
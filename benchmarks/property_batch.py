@@ -0,0 +1,130 @@
+"""Compare memory and DataFrame conversion time of Property storage layouts
+
+Run from the repository root:  python -m benchmarks.property_batch
+"""
+
+import gc
+import time
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from typing import Any, Callable, Dict, List, Tuple
+import pandas as pd
+from src.models.property import Property
+from src.models.property_batch import PropertyBatch
+
+RECORDS: int = 100_000
+
+# Same fields as Property, but a plain dataclass with a per-instance __dict__
+LegacyProperty = make_dataclass(
+    "LegacyProperty",
+    [(f.name, f.type, field(default=None)) for f in fields(Property)],
+)
+
+
+def _record_values(i: int) -> Dict:
+    return dict(
+        link=f"https://www.otodom.pl/pl/oferta/mieszkanie-{i}-ID{i:07d}",
+        id=f"{i:07d}",
+        price=500_000 + i,
+        location="ul. Obozowa, Koło, Wola, Warszawa, mazowieckie",
+        area=f"{30 + i % 90}m²",
+        rooms=str(1 + i % 5),
+        heating="miejskie",
+        floor=f"{i % 10}/10",
+        maintenance_fee="500 zł",
+        condition="do zamieszkania",
+        market="wtórny",
+        ownership="pełna własność",
+        advertiser_type="prywatny",
+        year_built=str(1950 + i % 70),
+        elevator="tak",
+        building_type="blok",
+        windows="plastikowe",
+        security="monitoring",
+        additional_features="balkon | piwnica",
+    )
+
+
+def _legacy_records(values: List[Dict]) -> List:
+    return [LegacyProperty(**v) for v in values]
+
+
+def _legacy_to_dataframe(records: List) -> pd.DataFrame:
+    return pd.DataFrame([record.__dict__ for record in records])
+
+
+def _slotted_records(values: List[Dict]) -> PropertyBatch:
+    return PropertyBatch([Property(**v) for v in values])
+
+
+def _columnar_records(values: List[Dict]) -> PropertyBatch:
+    batch = PropertyBatch()
+    for v in values:
+        batch.append_fields(**v)
+    return batch
+
+
+def _batch_to_dataframe(batch: PropertyBatch) -> pd.DataFrame:
+    return batch.to_dataframe()
+
+
+Layout = Tuple[Callable[[List[Dict]], Any], Callable[[Any], pd.DataFrame]]
+
+
+def _timed(func: Callable, arg) -> Tuple[Any, float]:
+    gc.collect()
+    start = time.perf_counter()
+    result = func(arg)
+    return result, time.perf_counter() - start
+
+
+def _traced_peak(func: Callable, arg) -> float:
+    """Peak MiB allocated by func(arg), on top of what was already held"""
+    gc.collect()
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def _measure(layout: Layout, values: List[Dict]) -> Dict[str, float]:
+    """Time building the records and to_dataframe() separately, then trace memory
+
+    Memory runs are separate, tracemalloc slows allocations down considerably.
+    """
+    build, convert = layout
+    records, build_seconds = _timed(build, values)
+    _, convert_seconds = _timed(convert, records)
+    convert_peak = _traced_peak(convert, records)
+    del records
+    build_peak = _traced_peak(build, values)
+    return {
+        "build_s": build_seconds,
+        "convert_s": convert_seconds,
+        "build_mib": build_peak,
+        "convert_mib": convert_peak,
+    }
+
+
+def main():
+    values = [_record_values(i) for i in range(RECORDS)]
+
+    layouts: Dict[str, Layout] = {
+        "dataclass + __dict__ rows": (_legacy_records, _legacy_to_dataframe),
+        "slotted Property + PropertyBatch": (_slotted_records, _batch_to_dataframe),
+        "PropertyBatch.append_fields": (_columnar_records, _batch_to_dataframe),
+    }
+
+    print(f"{RECORDS} records")
+    print(f"{'':<34} {'build':>8} {'to_dataframe':>13} {'build peak':>10} {'convert peak':>12}")
+    for name, layout in layouts.items():
+        result = _measure(layout, values)
+        print(
+            f"{name:<34} {result['build_s']:7.2f}s {result['convert_s']:12.2f}s "
+            f"{result['build_mib']:6.1f} MiB {result['convert_mib']:8.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
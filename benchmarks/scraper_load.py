@@ -0,0 +1,142 @@
+"""End-to-end scraper load test against the local otodom stand-in
+
+Runs BatchScraper over all district/listing type combinations served by
+benchmarks.otodom_standin and reports listings/s, request latency
+percentiles and peak memory. Nothing leaves the machine, so runs are
+repeatable and can be compared before and after a scraper change.
+
+Run from the repository root:  python -m benchmarks.scraper_load
+"""
+
+import json
+import logging
+import resource
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+from benchmarks.otodom_standin import OtodomStandIn, StandInConfig
+from src.cleaner.property_cleaner import PropertyDataCleaner
+from src.cleaner.stream_cleaner import StreamingCleaner
+from src.models.types import District, ListingType, ResultLimit
+from src.scraper.batch_scraper import BatchScraper
+from src.scraper.pipeline import FetchParsePipeline
+from src.scraper.transport import HttpTransport
+
+DISTRICTS: List[District] = list(District)
+LISTING_TYPES: List[ListingType] = list(ListingType)
+MAX_PROPERTIES: int = 150
+LIMIT: ResultLimit = ResultLimit.XLARGE
+FETCH_WORKERS: int = 16
+# None = one parser process per CPU core, 0 = parse on the fetch threads
+PARSE_WORKERS: Optional[int] = None
+POOL_SIZE: int = 32
+GLOBAL_SCHEDULER: bool = True
+# Also clean every record in-process, measures the streaming pipeline end to end
+STREAM_CLEAN: bool = False
+# Append the summary as one JSON line, e.g. "./bench_output.jsonl", to track regressions
+RESULTS_PATH: Optional[str] = None
+
+STANDIN: StandInConfig = StandInConfig(
+    latency_ms=50,
+    latency_jitter_ms=20,
+    tail_rate=0.01,
+    tail_latency_ms=1000,
+    error_rate=0.01,
+    max_requests_per_second=400,
+)
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_load_test() -> Dict:
+    """Scrape everything the stand-in serves, return the summary"""
+    with ExitStack() as stack:
+        standin = stack.enter_context(OtodomStandIn(STANDIN))
+        transport = stack.enter_context(HttpTransport(pool_size=POOL_SIZE))
+        pipeline = stack.enter_context(
+            FetchParsePipeline(fetch_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS)
+        )
+        sink = None
+        if STREAM_CLEAN:
+            clean_dir = stack.enter_context(tempfile.TemporaryDirectory())
+            sink = stack.enter_context(StreamingCleaner(PropertyDataCleaner(), clean_dir))
+
+        batch_scraper = stack.enter_context(
+            BatchScraper(
+                base_output_dir=None,
+                transport=transport,
+                max_workers=FETCH_WORKERS,
+                pipeline=pipeline,
+                sink=sink,
+                search_base_url=standin.search_base_url,
+            )
+        )
+
+        start = time.perf_counter()
+        if GLOBAL_SCHEDULER:
+            total = batch_scraper.scrape_scheduled(
+                districts=DISTRICTS,
+                listing_types=LISTING_TYPES,
+                limit=LIMIT,
+                max_properties=MAX_PROPERTIES,
+            )
+        else:
+            total = batch_scraper.scrape_multiple_combinations(
+                districts=DISTRICTS,
+                listing_types=LISTING_TYPES,
+                limit=LIMIT,
+                max_properties=MAX_PROPERTIES,
+                delay_seconds=0,
+            )
+        if sink is not None:
+            sink.flush()
+        elapsed = time.perf_counter() - start
+
+        latencies = transport.get_latency_percentiles((50, 99))
+        parser_peak_kib = pipeline.parser_peak_rss_kib
+        summary = {
+            "mode": "scheduled" if GLOBAL_SCHEDULER else "sequential",
+            "stream_clean": STREAM_CLEAN,
+            "fetch_workers": FETCH_WORKERS,
+            "listings": total,
+            "seconds": round(elapsed, 2),
+            "listings_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(latencies.get("p50", 0.0) * 1000, 1),
+            "p99_ms": round(latencies.get("p99", 0.0) * 1000, 1),
+            "transport": transport.get_metrics(),
+            "server_statuses": standin.stats(),
+        }
+
+    summary["peak_rss_mib"] = round(_peak_rss_mib(), 1)
+    # Parser processes run under the forkserver, so they report their own peak
+    summary["peak_parser_rss_mib"] = round(parser_peak_kib / 1024, 1)
+    return summary
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    summary = run_load_test()
+
+    print(
+        f"{summary['mode']}: {summary['listings']} listings in {summary['seconds']} s "
+        f"= {summary['listings_per_second']} listings/s"
+    )
+    print(f"request latency p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms")
+    print(
+        f"peak RSS {summary['peak_rss_mib']} MiB, "
+        f"largest parser process {summary['peak_parser_rss_mib']} MiB"
+    )
+    print(f"transport {summary['transport']}")
+    print(f"server responses {summary['server_statuses']}")
+
+    if RESULTS_PATH:
+        with open(RESULTS_PATH, "a", encoding="utf-8") as results:
+            results.write(json.dumps(summary) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import logging
+from typing import Collection, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FEATURES: Dict[str, float] = {
+    "price_per_m2": 1.0,
+    "area": 1.0,
+    "rooms": 0.5,
+    "year_built": 0.5,
+    "current_floor": 0.25,
+}
+
+FLAG_FEATURES: Dict[str, float] = {
+    "elevator": 0.25,
+    "balcony": 0.25,
+    "parking": 0.25,
+    "terrace": 0.25,
+    "garden": 0.25,
+    "basement": 0.1,
+    "separate_kitchen": 0.1,
+}
+
+# Features describing the value being estimated, left out of valuation queries
+VALUATION_EXCLUDED: Tuple[str, ...] = ("price_per_m2",)
+
+# Weight of the district one-hot block, large enough to prefer same-district comps
+DISTRICT_WEIGHT: float = 3.0
+
+
+def _with_price_per_m2(df: pd.DataFrame) -> pd.DataFrame:
+    if "price_per_m2" in df.columns or not {"price", "area"} <= set(df.columns):
+        return df
+    area = df["area"].astype("float64").where(df["area"] > 0)
+    return df.assign(price_per_m2=df["price"].astype("float64") / area)
+
+
+class ComparablesEngine:
+    """k-nearest-neighbour search for comparable listings
+
+    Features are standardized and weighted once into a contiguous float32
+    matrix. Queries run as blocked brute force: every block of subjects is
+    compared to all listings with matrix products, so thousands of subjects
+    are answered in one call. Features missing on a subject are left out of
+    its distance instead of being imputed.
+    """
+
+    def __init__(
+        self,
+        listings: pd.DataFrame,
+        numeric_features: Optional[Dict[str, float]] = None,
+        flag_features: Optional[Dict[str, float]] = None,
+        district_weight: float = DISTRICT_WEIGHT,
+        block_size: int = 1024,
+    ):
+        self.listings = _with_price_per_m2(listings).reset_index(drop=True)
+        self.numeric_features = numeric_features or NUMERIC_FEATURES
+        self.flag_features = flag_features or FLAG_FEATURES
+        self.district_weight = district_weight
+        self.block_size = block_size
+
+        numeric = self._numeric_values(self.listings)
+        self._means = np.nanmean(numeric, axis=0)
+        stds = np.nanstd(numeric, axis=0)
+        self._stds = np.where(stds > 0, stds, 1.0)
+        self._districts: List[str] = sorted(
+            self.listings["district"].dropna().unique().tolist()
+        ) if "district" in self.listings.columns else []
+
+        values, present = self._encode(self.listings)
+        # Missing reference values sit at the (standardized) mean
+        self._matrix = np.ascontiguousarray(np.where(present, values, 0.0), dtype=np.float32)
+        self._squared = np.ascontiguousarray(self._matrix**2)
+
+        logger.info(
+            f"Comps index ready: {self._matrix.shape[0]} listings, "
+            f"{self._matrix.shape[1]} features"
+        )
+
+    def _numeric_values(self, df: pd.DataFrame, exclude: Collection[str] = ()) -> np.ndarray:
+        columns = []
+        for feature in self.numeric_features:
+            if feature in df.columns and feature not in exclude:
+                columns.append(df[feature].astype("float64").to_numpy(na_value=np.nan))
+            else:
+                columns.append(np.full(len(df), np.nan))
+        return np.column_stack(columns) if columns else np.empty((len(df), 0))
+
+    def _encode(
+        self, df: pd.DataFrame, exclude: Collection[str] = ()
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Weighted feature matrix and mask of present values, excluded features count as missing"""
+        df = _with_price_per_m2(df)
+        numeric = (self._numeric_values(df, exclude) - self._means) / self._stds
+        numeric *= np.sqrt(np.fromiter(self.numeric_features.values(), dtype=np.float64))
+
+        flags = []
+        for feature, weight in self.flag_features.items():
+            if feature in df.columns and feature not in exclude:
+                values = df[feature].astype("float64").to_numpy(na_value=np.nan)
+            else:
+                values = np.full(len(df), np.nan)
+            flags.append(values * np.sqrt(weight))
+        flags = np.column_stack(flags) if flags else np.empty((len(df), 0))
+
+        district_block = np.zeros((len(df), len(self._districts)))
+        district_present = np.zeros((len(df), len(self._districts)), dtype=bool)
+        if self._districts and "district" in df.columns:
+            codes = pd.Categorical(df["district"], categories=self._districts).codes
+            known = codes >= 0
+            district_block[np.flatnonzero(known), codes[known]] = np.sqrt(self.district_weight)
+            district_present[df["district"].notna().to_numpy()] = True
+
+        values = np.hstack([numeric, flags, district_block])
+        present = np.hstack([~np.isnan(numeric), ~np.isnan(flags), district_present])
+        return np.nan_to_num(values), present
+
+    def query(
+        self,
+        subjects: pd.DataFrame,
+        k: int = 10,
+        exclude_same_id: bool = True,
+        exclude_features: Collection[str] = (),
+    ) -> pd.DataFrame:
+        """Find k comparable listings for every subject row
+
+        Returns one row per (subject, rank) with the subject's position in
+        `subjects`, the comparable's position in `listings` and the distance.
+        Features in `exclude_features` are ignored for the subjects, as if missing.
+        """
+        if k < 1:
+            raise ValueError("k must be 1 or greater")
+
+        subjects = subjects.reset_index(drop=True)
+        values, present = self._encode(subjects, exclude_features)
+        values = values.astype(np.float32)
+        mask = present.astype(np.float32)
+
+        listing_ids = (
+            self.listings["id"].astype("string").to_numpy(na_value="")
+            if exclude_same_id and "id" in self.listings.columns
+            else None
+        )
+        subject_ids = (
+            subjects["id"].astype("string").to_numpy(na_value="")
+            if listing_ids is not None and "id" in subjects.columns
+            else None
+        )
+
+        # One extra neighbour per subject leaves room to drop the subject itself
+        extra = 1 if subject_ids is not None else 0
+        n_neighbors = min(k + extra, len(self.listings))
+
+        frames = []
+        for start in range(0, len(subjects), self.block_size):
+            stop = start + self.block_size
+            q, m = values[start:stop], mask[start:stop]
+
+            # Masked squared distance: sum_j m_j * (q_j - x_j)^2
+            distances = (
+                (q**2).sum(axis=1, keepdims=True)
+                - 2.0 * q @ self._matrix.T
+                + m @ self._squared.T
+            )
+            np.maximum(distances, 0.0, out=distances)
+
+            nearest = np.argpartition(distances, n_neighbors - 1, axis=1)[:, :n_neighbors]
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1)
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+
+            subject_positions = np.repeat(np.arange(start, start + len(q)), n_neighbors)
+            frame = pd.DataFrame(
+                {
+                    "subject": subject_positions,
+                    "comp": nearest.ravel(),
+                    "distance": np.sqrt(nearest_distances.ravel()),
+                }
+            )
+            if subject_ids is not None:
+                same = subject_ids[frame["subject"]] == listing_ids[frame["comp"]]
+                same &= subject_ids[frame["subject"]] != ""
+                frame = frame[~same]
+            frames.append(frame)
+
+        result = pd.concat(frames, ignore_index=True)
+        result["rank"] = result.groupby("subject").cumcount() + 1
+        result = result[result["rank"] <= k].reset_index(drop=True)
+        return result[["subject", "rank", "comp", "distance"]]
+
+    def estimate_price_per_m2(self, subjects: pd.DataFrame, k: int = 10) -> pd.Series:
+        """Median price per m2 of each subject's comparables, chosen without its own price"""
+        comps = self.query(subjects, k=k, exclude_features=VALUATION_EXCLUDED)
+        comps["price_per_m2"] = self.listings["price_per_m2"].to_numpy()[comps["comp"]]
+        estimate = comps.groupby("subject")["price_per_m2"].median()
+        return estimate.reindex(range(len(subjects))).set_axis(subjects.index)
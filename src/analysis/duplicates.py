@@ -0,0 +1,247 @@
+import logging
+import zlib
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_COLUMN: str = "cluster_id"
+
+BLOCKING_COLUMNS: List[str] = ["district", "neighborhood", "rooms"]
+
+TEXT_COLUMNS: List[str] = ["street", "neighborhood", "district"]
+CATEGORY_COLUMNS: List[str] = [
+    "heating",
+    "condition",
+    "market",
+    "ownership",
+    "building_type",
+    "windows",
+    "year_built",
+    "current_floor",
+    "total_floors",
+]
+FLAG_COLUMNS: List[str] = [
+    "elevator",
+    "balcony",
+    "parking",
+    "terrace",
+    "garden",
+    "basement",
+    "separate_kitchen",
+]
+
+# Mersenne prime for universal hashing, a * h + b stays below 2**64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def _listing_tokens(row) -> List[str]:
+    """Address words plus field=value tokens describing one listing"""
+    tokens = []
+    for col in TEXT_COLUMNS:
+        value = getattr(row, col)
+        if not pd.isna(value):
+            tokens.extend(f"{col}:{word}" for word in str(value).lower().split())
+    for col in CATEGORY_COLUMNS:
+        value = getattr(row, col)
+        if not pd.isna(value):
+            tokens.append(f"{col}={value}")
+    for col in FLAG_COLUMNS:
+        value = getattr(row, col)
+        if not pd.isna(value) and bool(value):
+            tokens.append(col)
+    return tokens
+
+
+class DuplicateDetector:
+    """Clusters near-duplicate listings posted by different advertisers
+
+    Listings are blocked by district, neighborhood, rooms and area. Each
+    listing joins two overlapping area windows of 2 * max_area_diff, so any
+    two areas closer than max_area_diff share a block wherever bucket edges
+    fall. Within blocks, MinHash signatures over address and feature tokens
+    are banded for LSH, so only listings sharing a band bucket are compared.
+    Candidate pairs are confirmed on estimated Jaccard similarity, area and
+    price, and connected pairs form one cluster.
+
+    Cluster IDs are the smallest listing ID of the cluster, so they do not
+    depend on row order.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        min_similarity: float = 0.7,
+        max_price_diff: float = 0.05,
+        max_area_diff: float = 1.0,
+        max_bucket_size: int = 200,
+        seed: int = 42,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        if max_area_diff <= 0:
+            raise ValueError("max_area_diff must be positive")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.min_similarity = min_similarity
+        self.max_price_diff = max_price_diff
+        self.max_area_diff = max_area_diff
+        self.max_bucket_size = max_bucket_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def _signatures(self, tokens: List[List[str]], chunk_size: int = 50_000) -> np.ndarray:
+        """MinHash signature matrix (rows x num_perm), computed over flattened tokens"""
+        counts = np.array([len(t) for t in tokens])
+        owners = np.repeat(np.arange(len(tokens)), counts)
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for row in tokens for token in row),
+            dtype=np.uint64,
+            count=int(counts.sum()),
+        ) % _PRIME
+
+        signatures = np.full((len(tokens), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(hashes), chunk_size):
+            chunk = hashes[start : start + chunk_size, None]
+            permuted = (chunk * self._a + self._b) % _PRIME
+            np.minimum.at(signatures, owners[start : start + chunk_size], permuted)
+        return signatures
+
+    def _blocks(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """(position, block) rows, every listing in the two area windows around it"""
+        base = frame.groupby(BLOCKING_COLUMNS, dropna=True).ngroup().to_numpy()
+        area = frame["area"].astype("float64").to_numpy(na_value=np.nan)
+        known = (base >= 0) & ~np.isnan(area)
+
+        positions = np.flatnonzero(known)
+        # Window w covers buckets w and w + 1, a bucket is max_area_diff wide
+        bucket = np.floor(area[known] / self.max_area_diff).astype(np.int64)
+        windows = pd.DataFrame(
+            {
+                "position": np.concatenate([positions, positions]),
+                "base": np.concatenate([base[known], base[known]]),
+                "window": np.concatenate([bucket - 1, bucket]),
+            }
+        )
+        windows["block"] = windows.groupby(["base", "window"]).ngroup()
+        return windows[["position", "block"]]
+
+    def _candidate_pairs(self, blocks: pd.DataFrame, signatures: np.ndarray) -> np.ndarray:
+        """Pairs of row positions sharing a block and at least one LSH band"""
+        rows_per_band = self.num_perm // self.bands
+        positions = blocks["position"].to_numpy()
+        pairs = []
+
+        for band in range(self.bands):
+            band_values = signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+            band_hash = pd.util.hash_pandas_object(
+                pd.DataFrame(band_values), index=False
+            ).to_numpy()
+            buckets = pd.DataFrame(
+                {"block": blocks["block"].to_numpy(), "band": band_hash[positions]}
+            )
+            sizes = buckets.groupby(["block", "band"])["block"].transform("size")
+            buckets = buckets[(sizes > 1) & (sizes <= self.max_bucket_size)]
+
+            for members in buckets.groupby(["block", "band"]).indices.values():
+                bucket_positions = positions[buckets.index.to_numpy()[members]]
+                i, j = np.triu_indices(len(bucket_positions), k=1)
+                pairs.append(np.column_stack([bucket_positions[i], bucket_positions[j]]))
+
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        # A pair found in both shared windows is listed in either order
+        return np.unique(np.sort(np.vstack(pairs), axis=1), axis=0)
+
+    @staticmethod
+    def _connected_components(n: int, pairs: np.ndarray) -> np.ndarray:
+        """Union-find over accepted pairs, returns root position per row"""
+        parent = np.arange(n)
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j in pairs:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        return np.array([find(x) for x in range(n)])
+
+    def _cluster_roots(self, frame: pd.DataFrame) -> np.ndarray:
+        """Root row position of every row's cluster"""
+        tokens = [_listing_tokens(row) for row in frame.itertuples(index=False)]
+        signatures = self._signatures(tokens)
+        pairs = self._candidate_pairs(self._blocks(frame), signatures)
+
+        if len(pairs):
+            similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+            areas = frame["area"].astype("float64").to_numpy(na_value=np.nan)
+            area_ok = np.abs(areas[pairs[:, 0]] - areas[pairs[:, 1]]) <= self.max_area_diff
+            prices = frame["price"].astype("float64").to_numpy(na_value=np.nan)
+            price_a, price_b = prices[pairs[:, 0]], prices[pairs[:, 1]]
+            price_diff = np.abs(price_a - price_b) / np.fmax(price_a, price_b)
+            # Unknown prices neither confirm nor reject a pair
+            price_ok = np.isnan(price_diff) | (price_diff <= self.max_price_diff)
+            pairs = pairs[(similarity >= self.min_similarity) & area_ok & price_ok]
+
+        logger.info(f"Found {len(pairs)} duplicate pairs")
+        return self._connected_components(len(frame), pairs)
+
+    @staticmethod
+    def _unique_ids(frame: pd.DataFrame, id_column: str) -> pd.Series:
+        """Listing IDs made unique, repeats get "-1", "-2"... in a row-order independent way"""
+        if id_column not in frame.columns:
+            raise ValueError(f"Cannot cluster, missing column '{id_column}'")
+        ids = frame[id_column].astype("string")
+        if ids.isna().any():
+            raise ValueError(f"Cannot cluster, column '{id_column}' has missing IDs")
+
+        repeated = ids.duplicated(keep=False)
+        if not repeated.any():
+            return ids
+
+        # Rows sharing an ID are numbered by content, so input order does not matter
+        content = pd.util.hash_pandas_object(frame, index=False)
+        order = pd.DataFrame({"id": ids, "content": content})[repeated]
+        order = order.sort_values(["id", "content"], kind="stable")
+        rank = order.groupby("id").cumcount()
+        suffixed = order["id"] + rank.map(lambda n: f"-{n}" if n else "")
+
+        logger.warning(
+            f"{repeated.sum()} rows share {ids[repeated].nunique()} IDs in '{id_column}', "
+            f"numbering the repeats"
+        )
+        ids = ids.copy()
+        ids[suffixed.index] = suffixed
+        return ids
+
+    def assign_clusters(self, df: pd.DataFrame, id_column: Optional[str] = "id") -> pd.DataFrame:
+        """Add cluster_id column, equal for all listings of one physical property
+
+        Cluster IDs are the smallest listing ID in the cluster. With
+        id_column=None they are row positions of the input instead.
+        """
+        frame = df.reset_index(drop=True)
+        roots = self._cluster_roots(frame)
+
+        if id_column is None:
+            cluster_ids = roots.astype(str)
+        else:
+            ids = self._unique_ids(frame, id_column)
+            cluster_ids = ids.groupby(roots).transform("min").to_numpy()
+
+        clusters = pd.Series(roots).nunique()
+        logger.info(f"{len(frame)} listings form {clusters} distinct properties")
+
+        result = df.copy()
+        result[CLUSTER_COLUMN] = cluster_ids
+        return result
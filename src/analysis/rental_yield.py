@@ -0,0 +1,184 @@
+import logging
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+AREA_BUCKET_EDGES: List[float] = [0, 30, 45, 60, 80, 100, np.inf]
+AREA_BUCKET_LABELS: List[str] = ["<30", "30-45", "45-60", "60-80", "80-100", "100+"]
+SEGMENT_COLUMNS: List[str] = ["district", "neighborhood", "rooms", "area_bucket"]
+
+# Log-spaced price/m2 histogram bins, fine enough for ~1% quantile resolution
+SALE_BIN_EDGES: np.ndarray = np.geomspace(2_000, 80_000, 161)
+RENT_BIN_EDGES: np.ndarray = np.geomspace(10, 500, 161)
+
+DEFAULT_QUANTILES: Sequence[float] = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def segment_histograms(
+    df: pd.DataFrame, bin_edges: np.ndarray, label: str = "listings"
+) -> pd.DataFrame:
+    """Count listings per segment and price/m2 bin (segments x bins)
+
+    The result is a mergeable summary: histograms of several files or
+    snapshots are combined by adding them, no listing rows are kept.
+    Listings without price/m2 or segment, or outside the bin range, are
+    left out and counted in a warning.
+    """
+    area = df["area"].astype("float64")
+    price_per_m2 = df["price"].astype("float64") / area.where(area > 0)
+
+    frame = df[SEGMENT_COLUMNS[:-1]].assign(
+        area_bucket=pd.cut(area, AREA_BUCKET_EDGES, labels=AREA_BUCKET_LABELS, right=False),
+        price_bin=np.searchsorted(bin_edges, price_per_m2.to_numpy(na_value=np.nan), side="right") - 1,
+    )
+    known = price_per_m2.notna().to_numpy()
+    in_range = known & frame["price_bin"].between(0, len(bin_edges) - 2).to_numpy()
+    has_segment = frame[SEGMENT_COLUMNS].notna().all(axis=1).to_numpy()
+    frame = frame[in_range & has_segment]
+
+    dropped = len(df) - len(frame)
+    if dropped:
+        values = price_per_m2.to_numpy(na_value=np.nan)
+        logger.warning(
+            f"Left out {dropped} of {len(df)} {label}: "
+            f"{(~known).sum()} without price/m2, "
+            f"{(values < bin_edges[0]).sum()} below {bin_edges[0]:g}/m2, "
+            f"{(values >= bin_edges[-1]).sum()} at or above {bin_edges[-1]:g}/m2, "
+            f"{(in_range & ~has_segment).sum()} in range but without a segment"
+        )
+
+    counts = frame.groupby(SEGMENT_COLUMNS + ["price_bin"], observed=True).size()
+    histograms = counts.unstack("price_bin", fill_value=0)
+    return histograms.reindex(columns=range(len(bin_edges) - 1), fill_value=0)
+
+
+def _add_histograms(total: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+    if total is None:
+        return new
+    return total.add(new, fill_value=0).astype(np.int64)
+
+
+def _bin_centers(bin_edges: np.ndarray) -> np.ndarray:
+    return np.sqrt(bin_edges[:-1] * bin_edges[1:])
+
+
+def _weighted_quantiles(
+    weights: np.ndarray, values_sorted_order: np.ndarray, values: np.ndarray, quantiles: Sequence[float]
+) -> np.ndarray:
+    """Quantiles per row of a weights matrix over shared, fixed values"""
+    cumulative = np.cumsum(weights[:, values_sorted_order], axis=1)
+    cumulative /= cumulative[:, -1:]
+    sorted_values = values[values_sorted_order]
+    positions = np.stack(
+        [np.argmax(cumulative >= q, axis=1) for q in quantiles], axis=1
+    )
+    return sorted_values[positions]
+
+
+class RentalYieldAnalyzer:
+    """Gross rental yield per segment from pre-aggregated price histograms
+
+    Sales and rents are aggregated separately into per-segment price/m2
+    histograms (district, neighborhood, rooms, area bucket), so inputs can be
+    added file by file or snapshot by snapshot. Only the aggregates are
+    joined, on the segment key, and the yield distribution of a segment is
+    derived from its two histograms, never from listing pairs.
+    """
+
+    def __init__(
+        self,
+        sale_bin_edges: np.ndarray = SALE_BIN_EDGES,
+        rent_bin_edges: np.ndarray = RENT_BIN_EDGES,
+    ):
+        self.sale_bin_edges = sale_bin_edges
+        self.rent_bin_edges = rent_bin_edges
+        self._sales: Optional[pd.DataFrame] = None
+        self._rents: Optional[pd.DataFrame] = None
+        # Listings added but left out of the histograms, n_sales/n_rents exclude them
+        self.dropped: Dict[str, int] = {"sales": 0, "rents": 0}
+
+    def add_sales(self, df: pd.DataFrame) -> None:
+        """Aggregate sale listings into the running per-segment histograms"""
+        histograms = segment_histograms(df, self.sale_bin_edges, label="sales")
+        self.dropped["sales"] += len(df) - int(histograms.to_numpy().sum())
+        self._sales = _add_histograms(self._sales, histograms)
+
+    def add_rents(self, df: pd.DataFrame) -> None:
+        """Aggregate rent listings into the running per-segment histograms"""
+        histograms = segment_histograms(df, self.rent_bin_edges, label="rents")
+        self.dropped["rents"] += len(df) - int(histograms.to_numpy().sum())
+        self._rents = _add_histograms(self._rents, histograms)
+
+    def yields(
+        self,
+        min_count: int = 3,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        chunk_size: int = 256,
+    ) -> pd.DataFrame:
+        """Yield distribution per segment present on both sides
+
+        Annual gross yield = 12 * rent per m2 / sale price per m2. Its
+        distribution assumes rents and sale prices within a segment are
+        independent, weighting every (rent bin, sale bin) pair by the
+        product of their counts.
+        """
+        if self._sales is None or self._rents is None:
+            raise ValueError("Both sales and rents must be added before computing yields")
+
+        # Hash join of the two aggregate tables on the segment key
+        joined = self._rents.join(
+            self._sales, how="inner", lsuffix="_rent", rsuffix="_sale"
+        )
+        rent_hist = joined.iloc[:, : self._rents.shape[1]].to_numpy(dtype=np.float64)
+        sale_hist = joined.iloc[:, self._rents.shape[1] :].to_numpy(dtype=np.float64)
+
+        n_rents = rent_hist.sum(axis=1)
+        n_sales = sale_hist.sum(axis=1)
+        enough = (n_rents >= min_count) & (n_sales >= min_count)
+        joined, rent_hist, sale_hist = joined[enough], rent_hist[enough], sale_hist[enough]
+        n_rents, n_sales = n_rents[enough], n_sales[enough]
+        if not len(joined):
+            logger.warning(f"No segment has at least {min_count} sales and rents")
+            return pd.DataFrame(columns=SEGMENT_COLUMNS + ["n_rents", "n_sales"])
+
+        rent_centers = _bin_centers(self.rent_bin_edges)
+        sale_centers = _bin_centers(self.sale_bin_edges)
+        yield_grid = (12 * rent_centers[:, None] / sale_centers[None, :]).ravel()
+        yield_order = np.argsort(yield_grid)
+
+        yield_quantiles = []
+        for start in range(0, len(joined), chunk_size):
+            rents = rent_hist[start : start + chunk_size]
+            sales = sale_hist[start : start + chunk_size]
+            pair_weights = (rents[:, :, None] * sales[:, None, :]).reshape(len(rents), -1)
+            yield_quantiles.append(
+                _weighted_quantiles(pair_weights, yield_order, yield_grid, quantiles)
+            )
+        yield_quantiles = np.vstack(yield_quantiles)
+
+        result = pd.DataFrame(index=joined.index)
+        result["n_rents"] = n_rents.astype(np.int64)
+        result["n_sales"] = n_sales.astype(np.int64)
+        result["median_rent_per_m2"] = _weighted_quantiles(
+            rent_hist, np.arange(len(rent_centers)), rent_centers, [0.5]
+        )[:, 0]
+        result["median_sale_per_m2"] = _weighted_quantiles(
+            sale_hist, np.arange(len(sale_centers)), sale_centers, [0.5]
+        )[:, 0]
+        for i, q in enumerate(quantiles):
+            result[f"yield_p{round(q * 100)}"] = yield_quantiles[:, i]
+
+        logger.info(f"Computed yields for {len(result)} segments")
+        return result.reset_index()
+
+
+def rental_yields(
+    sales: pd.DataFrame, rents: pd.DataFrame, min_count: int = 3
+) -> pd.DataFrame:
+    """One-shot yield table for a single sales and rents dataset"""
+    analyzer = RentalYieldAnalyzer()
+    analyzer.add_sales(sales)
+    analyzer.add_rents(rents)
+    return analyzer.yields(min_count=min_count)
@@ -1,7 +1,13 @@
 import logging
 import pandas as pd
 from pathlib import Path
+from typing import Optional
+from ..analysis.duplicates import DuplicateDetector
+from ..models.types import ListingType
+from ..scraper.raw_store import raw_output_directory
 from .property_cleaner import PropertyDataCleaner
+from .quality_rules import DataQualityChecker
+from .schema import read_clean_csv
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +18,13 @@ class BatchCleaner:
         property_cleaner: PropertyDataCleaner,
         raw_dir: str = "./data/raw",
         clean_dir: str = "./data/clean",
+        quarantine_dir: Optional[str] = None,
     ):
         self.property_cleaner = property_cleaner
         self.raw_dir = Path(raw_dir)
         self.clean_dir = Path(clean_dir)
+        # Data quality rules only run when there is somewhere to put failing rows
+        self.quarantine_dir = Path(quarantine_dir) if quarantine_dir else None
 
     def clean_all_files(self) -> None:
         """Clean all CSV files in the raw directory structure"""
@@ -25,9 +34,9 @@ class BatchCleaner:
             return
 
         # Process both rents and sales directories
-        for listing_type in ["rents", "sales"]:
-            raw_type_dir = self.raw_dir / listing_type
-            clean_type_dir = self.clean_dir / listing_type
+        for listing_type in [ListingType.RENT, ListingType.SALE]:
+            raw_type_dir = Path(raw_output_directory(str(self.raw_dir), listing_type))
+            clean_type_dir = Path(raw_output_directory(str(self.clean_dir), listing_type))
 
             if not raw_type_dir.exists():
                 logger.warning(f"Directory does not exist: {raw_type_dir}")
@@ -42,9 +51,23 @@ class BatchCleaner:
 
             logger.info(f"Found {len(csv_files)} files to clean in {raw_type_dir}")
 
+            quality_checker = (
+                DataQualityChecker.for_listing_type(listing_type)
+                if self.quarantine_dir is not None
+                else None
+            )
+
             for csv_file in csv_files:
                 output_file = clean_type_dir / csv_file.name
-                self.property_cleaner.clean_single_file(csv_file, output_file)
+                quarantine_file = (
+                    Path(raw_output_directory(str(self.quarantine_dir), listing_type))
+                    / csv_file.name
+                    if self.quarantine_dir is not None
+                    else None
+                )
+                self.property_cleaner.clean_single_file(
+                    csv_file, output_file, quality_checker, quarantine_file
+                )
 
     def combine_csv_files(self, source_dir: Path, output_path: Path) -> None:
         """Combine all CSV files in source directory into one file at output path"""
@@ -59,7 +82,7 @@ class BatchCleaner:
 
         for csv_file in cleaned_csv_files:
             try:
-                df = pd.read_csv(csv_file)
+                df = read_clean_csv(csv_file)
                 combined_dfs.append(df)
                 logger.info(f"Added {len(df)} rows from {csv_file.name}")
             except Exception as e:
@@ -70,3 +93,21 @@ class BatchCleaner:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             final_df.to_csv(output_path, index=False, encoding="utf-8-sig")
             logger.info(f"Combined {len(final_df)} rows into {output_path}")
+
+    def mark_duplicates(
+        self, combined_path: Path, detector: Optional[DuplicateDetector] = None
+    ) -> None:
+        """Add cluster_id to a combined file, so each property can be counted once"""
+
+        if not combined_path.exists():
+            logger.warning(f"Combined file does not exist: {combined_path}")
+            return
+
+        detector = detector or DuplicateDetector()
+        df = read_clean_csv(combined_path)
+        df = detector.assign_clusters(df)
+        df.to_csv(combined_path, index=False, encoding="utf-8-sig")
+        logger.info(
+            f"Marked {df['cluster_id'].nunique()} distinct properties "
+            f"among {len(df)} rows in {combined_path}"
+        )
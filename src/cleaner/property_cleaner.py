@@ -4,19 +4,27 @@ import re
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
+from ..geo.gazetteer import Geocoder
+from .quality_rules import DataQualityChecker
+from .schema import schema_for
 
 logger = logging.getLogger(__name__)
 
 
 class PropertyDataCleaner:
-    def __init__(self):
+    def __init__(self, geocoder: Optional[Geocoder] = None):
         pd.set_option("display.max_colwidth", None)
+        self.geocoder = geocoder
 
     def _clean_price(self, price) -> Optional[int]:
         """Clean price data - remove any non-numeric characters except digits"""
         if pd.isna(price):
             return pd.NA
 
+        # Prices read back from raw CSV are floats, "529000.0" must not become 5290000
+        if isinstance(price, (int, float, np.number)):
+            return int(price)
+
         # Convert to string and extract only digits
         price_str = str(price)
         price_numbers = re.sub(r"[^\d]", "", price_str)
@@ -30,10 +38,10 @@ class PropertyDataCleaner:
         if pd.isna(fee):
             return np.nan
 
-        # Extract numbers from maintenance fee
-        match = re.search(r"\d+", str(fee))
+        # Extract numbers from maintenance fee, keeping thousands groups ("1 100 zł")
+        match = re.search(r"\d+(?:\s\d{3})*", str(fee))
         if match:
-            return int(match.group(0))
+            return int(re.sub(r"\s", "", match.group(0)))
         return np.nan
 
     def _clean_area(self, area) -> Optional[float]:
@@ -122,7 +130,7 @@ class PropertyDataCleaner:
         elif elevator_str == "nie":
             return False
         else:
-            return pd.Na
+            return pd.NA
 
     def _extract_security_features(
         self, security_features
@@ -167,72 +175,86 @@ class PropertyDataCleaner:
             "separate_kitchen": "oddzielna kuchnia" in features_str,
         }
 
-    def clean_single_file(self, input_path: Path, output_path: Path) -> None:
+    def clean_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Clean raw listing columns, as scraped or read back from raw CSV"""
+
+        df = df.reset_index(drop=True)
+
+        # Apply cleaning functions
+        df["price"] = df["price"].apply(self._clean_price)
+        df["area"] = df["area"].apply(self._clean_area)
+        df["rooms"] = df["rooms"].apply(self._clean_rooms)
+        df["maintenance_fee"] = df["maintenance_fee"].apply(
+            self._clean_maintenance_fee
+        )
+        df["year_built"] = df["year_built"].apply(self._clean_year_built)
+        df["elevator"] = df["elevator"].apply(self._clean_elevator)
+
+        # Split location into separate columns
+        location_split = df["location"].apply(self._split_location)
+        location_df = pd.DataFrame(location_split.to_list())
+        df = pd.concat([df, location_df], axis=1)
+
+        # Split floor information
+        floor_split = df["floor"].apply(self._split_floor)
+        floor_df = pd.DataFrame(floor_split.to_list())
+        df = pd.concat([df, floor_df], axis=1)
+
+        # Extract security features
+        security_features = df["security"].apply(self._extract_security_features)
+        security_df = pd.DataFrame(security_features.to_list())
+        df = pd.concat([df, security_df], axis=1)
+
+        # Extract additional features
+        additional_features_data = df["additional_features"].apply(
+            self._extract_additional_features
+        )
+        additional_features_df = pd.DataFrame(additional_features_data.to_list())
+        df = pd.concat([df, additional_features_df], axis=1)
+
+        # Drop original columns that were split
+        columns_to_drop = ["link", "location", "floor", "security", "additional_features"]
+        existing_columns_to_drop = [
+            col for col in columns_to_drop if col in df.columns
+        ]
+        df = df.drop(existing_columns_to_drop, axis=1)
+
+        # Attach coordinates from the offline gazetteer
+        if self.geocoder is not None:
+            df = self.geocoder.attach_coordinates(df)
+
+        # Adjust data types - do this AFTER all cleaning
+        return df.astype(schema_for(df.columns.to_list()))
+
+    def clean_single_file(
+        self,
+        input_path: Path,
+        output_path: Path,
+        quality_checker: Optional[DataQualityChecker] = None,
+        quarantine_path: Optional[Path] = None,
+    ) -> None:
         """Clean a single CSV file"""
 
         try:
             logger.info(f"Cleaning: {input_path}")
-            df = pd.read_csv(input_path)
-
-            # Apply cleaning functions
-            df["price"] = df["price"].apply(self._clean_price)
-            df["area"] = df["area"].apply(self._clean_area)
-            df["rooms"] = df["rooms"].apply(self._clean_rooms)
-            df["maintenance_fee"] = df["maintenance_fee"].apply(
-                self._clean_maintenance_fee
-            )
-            df["year_built"] = df["year_built"].apply(self._clean_year_built)
-            df["elevator"] = df["elevator"].apply(self._clean_elevator)
-
-            # Split location into separate columns
-            location_split = df["location"].apply(self._split_location)
-            location_df = pd.DataFrame(location_split.to_list())
-            df = pd.concat([df, location_df], axis=1)
-
-            # Split floor information
-            floor_split = df["floor"].apply(self._split_floor)
-            floor_df = pd.DataFrame(floor_split.to_list())
-            df = pd.concat([df, floor_df], axis=1)
-
-            # Extract security features
-            security_features = df["security"].apply(self._extract_security_features)
-            security_df = pd.DataFrame(security_features.to_list())
-            df = pd.concat([df, security_df], axis=1)
-
-            # Extract additional features
-            additional_features_data = df["additional_features"].apply(
-                self._extract_additional_features
-            )
-            additional_features_df = pd.DataFrame(additional_features_data.to_list())
-            df = pd.concat([df, additional_features_df], axis=1)
-
-            # Drop original columns that were split
-            columns_to_drop = ["link", "location", "floor", "security", "additional_features"]
-            existing_columns_to_drop = [
-                col for col in columns_to_drop if col in df.columns
-            ]
-            df = df.drop(existing_columns_to_drop, axis=1)
-
-            # Adjust data types - do this AFTER all cleaning
-            type_conversions = {}
-            
-            if "price" in df.columns:
-                type_conversions["price"] = "Int64"
-            if "rooms" in df.columns:
-                type_conversions["rooms"] = "Int64"
-            if "maintenance_fee" in df.columns:
-                type_conversions["maintenance_fee"] = "Int64"
-            if "year_built" in df.columns:
-                type_conversions["year_built"] = "Int64"
-            if "current_floor" in df.columns:
-                type_conversions["current_floor"] = "Int64"
-            if "total_floors" in df.columns:
-                type_conversions["total_floors"] = "Int64"
-            if "elevator" in df.columns:
-                type_conversions["elevator"] = "boolean"
-            
-            # Apply type conversions
-            df = df.astype(type_conversions)
+            df = self.clean_frame(pd.read_csv(input_path))
+
+            # Move rows failing data quality rules to quarantine
+            quarantined = None
+            if quality_checker is not None:
+                df, quarantined = quality_checker.split(df)
+
+            if quarantine_path is not None:
+                if quarantined is not None and len(quarantined):
+                    quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+                    quarantined.to_csv(
+                        quarantine_path, index=False, encoding="utf-8-sig"
+                    )
+                    logger.info(f"Quarantined rows saved: {quarantine_path}")
+                elif quarantine_path.exists():
+                    # Left by an earlier run, it no longer matches this output
+                    quarantine_path.unlink()
+                    logger.info(f"Removed stale quarantine file: {quarantine_path}")
 
             # Save cleaned data
             output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,174 @@
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..models.types import ListingType
+
+logger = logging.getLogger(__name__)
+
+REASON_COLUMN: str = "quality_issues"
+
+
+def _price_per_m2(df: pd.DataFrame) -> pd.Series:
+    area = df["area"].astype("Float64").where(df["area"] > 0)
+    return df["price"].astype("Float64") / area
+
+
+# Values computed once per frame and shared by all rules referring to them
+DERIVED_COLUMNS = {"price_per_m2": _price_per_m2}
+
+
+@dataclass(frozen=True)
+class RangeRule:
+    """Flags values outside [min_value, max_value], missing and allowed values pass"""
+
+    column: str
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    allowed_values: Tuple[float, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_out_of_range"
+
+    def violations(self, values: Dict[str, pd.Series]) -> pd.Series:
+        column = values[self.column]
+        mask = pd.Series(False, index=column.index)
+        if self.min_value is not None:
+            mask |= (column < self.min_value).fillna(False)
+        if self.max_value is not None:
+            mask |= (column > self.max_value).fillna(False)
+        if self.allowed_values:
+            mask &= ~column.isin(self.allowed_values).fillna(False)
+        return mask
+
+
+@dataclass(frozen=True)
+class GroupOutlierRule:
+    """Flags values far from their group's median, on log scale using MAD"""
+
+    column: str
+    group_by: str = "district"
+    max_deviation: float = 5.0
+    min_group_size: int = 10
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_{self.group_by}_outlier"
+
+    def violations(self, values: Dict[str, pd.Series]) -> pd.Series:
+        column = values[self.column].astype("float64")
+        log_values = np.log(column.where(column > 0))
+        groups = values[self.group_by]
+
+        grouped = log_values.groupby(groups)
+        median = grouped.transform("median")
+        deviation = (log_values - median).abs()
+        mad = deviation.groupby(groups).transform("median")
+        size = grouped.transform("count")
+
+        # 1.4826 * MAD estimates the standard deviation of normal data
+        robust_z = deviation / (1.4826 * mad.where(mad > 0))
+        mask = (robust_z > self.max_deviation) & (size >= self.min_group_size)
+        return mask.fillna(False)
+
+
+@dataclass(frozen=True)
+class ConsistencyRule:
+    """Flags rows where lower_column is greater than upper_column"""
+
+    lower_column: str
+    upper_column: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.lower_column}_above_{self.upper_column}"
+
+    def violations(self, values: Dict[str, pd.Series]) -> pd.Series:
+        lower = values[self.lower_column]
+        upper = values[self.upper_column]
+        return (lower > upper).fillna(False)
+
+
+def default_rules(listing_type: ListingType) -> List:
+    """Default rule set for sale or rent listings"""
+    common = [
+        RangeRule("area", 10, 1000),
+        RangeRule("rooms", 1, 20),
+        RangeRule("year_built", 1800, date.today().year + 5),
+        RangeRule("total_floors", 1, 60),
+        RangeRule("current_floor", 0, 60),
+        # "0" means no separate fee, single-digit fees are parsing garbage
+        RangeRule("maintenance_fee", 20, 10_000, allowed_values=(0,)),
+        ConsistencyRule("current_floor", "total_floors"),
+        GroupOutlierRule("price_per_m2", group_by="district"),
+    ]
+
+    if listing_type == ListingType.SALE:
+        return common + [
+            RangeRule("price", 50_000, 50_000_000),
+            RangeRule("price_per_m2", 2_000, 80_000),
+        ]
+    if listing_type == ListingType.RENT:
+        return common + [
+            RangeRule("price", 300, 100_000),
+            RangeRule("price_per_m2", 10, 500),
+        ]
+    raise ValueError(f"Unknown listing type: {listing_type}")
+
+
+class DataQualityChecker:
+    """Evaluates declarative rules as vectorized masks and splits off failing rows"""
+
+    def __init__(self, rules: List):
+        self.rules = rules
+
+    @classmethod
+    def for_listing_type(cls, listing_type: ListingType) -> "DataQualityChecker":
+        return cls(default_rules(listing_type))
+
+    def _rule_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Collect source and derived columns the rules need, computed once"""
+        values: Dict[str, pd.Series] = {col: df[col] for col in df.columns}
+        for name, compute in DERIVED_COLUMNS.items():
+            try:
+                values[name] = compute(df)
+            except KeyError:
+                pass
+        return values
+
+    def evaluate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Get boolean violation matrix, one column per applicable rule"""
+        values = self._rule_columns(df)
+        violations = {}
+
+        for rule in self.rules:
+            try:
+                violations[rule.name] = rule.violations(values).astype(bool)
+            except KeyError as e:
+                logger.debug(f"Skipping rule {rule.name}, missing column {e}")
+
+        return pd.DataFrame(violations, index=df.index)
+
+    def split(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split frame into (passing rows, quarantined rows with reasons)"""
+        violations = self.evaluate(df)
+        if violations.empty:
+            return df, df.iloc[0:0].assign(**{REASON_COLUMN: pd.Series(dtype="string")})
+
+        matrix = violations.to_numpy()
+        failing = matrix.any(axis=1)
+
+        rule_names = violations.columns.to_numpy()
+        reasons = ["; ".join(rule_names[row]) for row in matrix[failing]]
+
+        quarantined = df[failing].assign(**{REASON_COLUMN: reasons})
+        passed = df[~failing]
+
+        if len(quarantined):
+            counts = violations.sum().loc[lambda s: s > 0].to_dict()
+            logger.info(f"Quarantined {len(quarantined)} of {len(df)} rows: {counts}")
+
+        return passed, quarantined
@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+import pandas as pd
+
+# Column dtypes of cleaned listing files, in the order clean_single_file writes them
+CLEAN_SCHEMA: Dict[str, str] = {
+    "id": "string",
+    "price": "Int64",
+    "area": "float64",
+    "rooms": "Int64",
+    "heating": "string",
+    "maintenance_fee": "Int64",
+    "condition": "string",
+    "market": "string",
+    "ownership": "string",
+    "advertiser_type": "string",
+    "year_built": "Int64",
+    "elevator": "boolean",
+    "building_type": "string",
+    "windows": "string",
+    "district": "string",
+    "neighborhood": "string",
+    "street": "string",
+    "current_floor": "Int64",
+    "total_floors": "Int64",
+    "gated_area": "boolean",
+    "monitoring": "boolean",
+    "security_guard": "boolean",
+    "balcony": "boolean",
+    "parking": "boolean",
+    "terrace": "boolean",
+    "garden": "boolean",
+    "basement": "boolean",
+    "utility_rooms": "boolean",
+    "non_smokers_only": "boolean",
+    "students_allowed": "boolean",
+    "separate_kitchen": "boolean",
+    "lat": "float64",
+    "lon": "float64",
+    "geo_precision": "string",
+    "cluster_id": "string",
+}
+
+
+def schema_for(columns: List[str]) -> Dict[str, str]:
+    """Get schema dtypes for the given columns, skipping unknown ones"""
+    return {col: CLEAN_SCHEMA[col] for col in columns if col in CLEAN_SCHEMA}
+
+
+def read_clean_csv(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read cleaned CSV keeping the nullable Int64/boolean/string dtypes"""
+    header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns.to_list()
+    usecols = header if columns is None else [col for col in columns if col in header]
+
+    return pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype=schema_for(usecols),
+        encoding="utf-8-sig",
+    )[usecols]
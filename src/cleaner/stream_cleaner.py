@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+import pandas as pd
+from ..models.property import Property
+from ..models.property_batch import PropertyBatch
+from ..models.types import District, ListingType
+from ..scraper.raw_store import raw_csv_path
+from .property_cleaner import PropertyDataCleaner
+from .quality_rules import DataQualityChecker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE: int = 100
+DEFAULT_MAX_DELAY_SECONDS: float = 5.0
+
+SeriesKey = Tuple[District, ListingType]
+
+
+class StreamingCleaner:
+    """Cleans scraped Property objects in micro-batches and appends them to the clean store
+
+    Records are buffered per district and listing type in a PropertyBatch and
+    flushed through PropertyDataCleaner.clean_frame once `batch_size` records
+    are waiting or the oldest one has waited `max_delay_seconds`. Output files
+    follow the BatchCleaner layout (clean_dir/<type>/<district>_<type>.csv).
+    Entering the cleaner starts a run: the clean and quarantine files of every
+    series are removed, so series without records this run leave no file
+    behind, and each file is appended to as its batches arrive.
+
+    Data quality rules run per micro-batch, so group outlier rules only fire
+    once a batch holds enough listings of a group.
+    """
+
+    def __init__(
+        self,
+        property_cleaner: PropertyDataCleaner,
+        clean_dir: str = "./data/clean",
+        quarantine_dir: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be 1 or greater")
+
+        self.property_cleaner = property_cleaner
+        self.clean_dir = Path(clean_dir)
+        self.quarantine_dir = Path(quarantine_dir) if quarantine_dir else None
+        self.batch_size = batch_size
+        self.max_delay_seconds = max_delay_seconds
+
+        self._buffers: Dict[SeriesKey, PropertyBatch] = {}
+        self._oldest: Dict[SeriesKey, float] = {}
+        self._started: Set[Path] = set()
+        self._checkers: Dict[ListingType, Optional[DataQualityChecker]] = {}
+        self._lock = threading.Lock()
+        self.records_written = 0
+
+    def output_path(self, district: District, listing_type: ListingType) -> Path:
+        """Clean file of one district-listing type series"""
+        return Path(raw_csv_path(str(self.clean_dir), district, listing_type))
+
+    def quarantine_path(self, district: District, listing_type: ListingType) -> Path:
+        """Quarantine file of one district-listing type series"""
+        return Path(raw_csv_path(str(self.quarantine_dir), district, listing_type))
+
+    def start_run(self) -> None:
+        """Remove clean and quarantine files of every series left by an earlier run"""
+        removed = 0
+        for district in District:
+            for listing_type in ListingType:
+                paths = [self.output_path(district, listing_type)]
+                if self.quarantine_dir is not None:
+                    paths.append(self.quarantine_path(district, listing_type))
+                for path in paths:
+                    if path.exists():
+                        path.unlink()
+                        removed += 1
+        self._started.clear()
+        if removed:
+            logger.info(f"Removed {removed} series files of an earlier run")
+
+    def _quality_checker(self, listing_type: ListingType) -> Optional[DataQualityChecker]:
+        # Same rule as BatchCleaner: quality rules only run with a quarantine to write to
+        if self.quarantine_dir is None:
+            return None
+        if listing_type not in self._checkers:
+            self._checkers[listing_type] = DataQualityChecker.for_listing_type(listing_type)
+        return self._checkers[listing_type]
+
+    def add(
+        self,
+        properties: Iterable[Property],
+        district: District,
+        listing_type: ListingType,
+    ) -> None:
+        """Buffer scraped properties, flushing the series if its batch is due"""
+        key = (district, listing_type)
+        with self._lock:
+            buffer = self._buffers.setdefault(key, PropertyBatch())
+            buffer.extend(properties)
+            if not len(buffer):
+                return
+            self._oldest.setdefault(key, time.monotonic())
+
+            waited = time.monotonic() - self._oldest[key]
+            if len(buffer) >= self.batch_size or waited >= self.max_delay_seconds:
+                self._flush_series(key)
+
+    def flush(self) -> None:
+        """Clean and write everything still buffered"""
+        with self._lock:
+            for key in list(self._buffers):
+                self._flush_series(key)
+
+    def _flush_series(self, key: SeriesKey) -> None:
+        buffer = self._buffers[key]
+        if not len(buffer):
+            return
+
+        district, listing_type = key
+        raw_df = buffer.to_dataframe()
+        buffer.clear()
+        waited = time.monotonic() - self._oldest.pop(key)
+
+        try:
+            df = self.property_cleaner.clean_frame(raw_df)
+
+            quality_checker = self._quality_checker(listing_type)
+            if quality_checker is not None:
+                df, quarantined = quality_checker.split(df)
+                if len(quarantined):
+                    self._append_csv(quarantined, self.quarantine_path(district, listing_type))
+
+            output_path = self.output_path(district, listing_type)
+            self._append_csv(df, output_path)
+            self.records_written += len(df)
+
+            logger.info(
+                f"Streamed {len(df)} clean records to {output_path} "
+                f"(oldest waited {waited:.1f}s)"
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Failed to clean batch of {len(raw_df)} for "
+                f"{district.name} - {listing_type.name}: {e}"
+            )
+
+    def _append_csv(self, df: pd.DataFrame, path: Path) -> None:
+        """Write header and BOM on the first write of this run, plain rows after"""
+        if path not in self._started:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_csv(path, index=False, encoding="utf-8-sig")
+            self._started.add(path)
+        else:
+            df.to_csv(path, mode="a", header=False, index=False, encoding="utf-8")
+
+    def close(self) -> None:
+        """Flush remaining buffers"""
+        self.flush()
+        logger.info(f"Streaming cleaner wrote {self.records_written} clean records")
+
+    def __enter__(self) -> "StreamingCleaner":
+        self.start_run()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
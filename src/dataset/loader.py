@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+import pandas as pd
+from ..cleaner.schema import CLEAN_SCHEMA, read_clean_csv
+from ..models.types import DISTRICT_NAMES, District, ListingType
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+except ImportError:  # optional dependency, loads fall back to typed CSV reads
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+COMBINED_DIR: str = "./data/clean/combined"
+# pandas dtype_backend names: schema dtypes (copied) or ArrowDtype (mmap-backed)
+DTYPE_BACKENDS = ("numpy_nullable", "pyarrow")
+CACHE_DIRNAME: str = ".cache"
+CACHE_METADATA_KEY: bytes = b"source_fingerprint"
+
+COMBINED_FILES: Dict[ListingType, str] = {
+    ListingType.SALE: "warsaw_all_sales.csv",
+    ListingType.RENT: "warsaw_all_rents.csv",
+}
+
+
+def _source_fingerprint(source: Path) -> str:
+    """Fingerprint of the CSV and schema, any change invalidates the cache"""
+    stat = source.stat()
+    return json.dumps(
+        {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "schema": CLEAN_SCHEMA},
+        sort_keys=True,
+    )
+
+
+def _cache_path(source: Path) -> Path:
+    return source.parent / CACHE_DIRNAME / f"{source.stem}.arrow"
+
+
+def _cache_is_fresh(cache: Path, fingerprint: str) -> bool:
+    if not cache.exists():
+        return False
+    try:
+        metadata = feather.read_table(cache, memory_map=True).schema.metadata or {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache {cache}: {e}")
+        return False
+    return metadata.get(CACHE_METADATA_KEY) == fingerprint.encode("utf-8")
+
+
+def _build_cache(source: Path, cache: Path, fingerprint: str) -> None:
+    """Convert typed CSV into an uncompressed (memory-mappable) Arrow file"""
+    logger.info(f"Building Arrow cache for {source}")
+    table = pa.Table.from_pandas(read_clean_csv(source), preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), CACHE_METADATA_KEY: fingerprint}
+    )
+
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temp file and rename, so concurrent readers never see partial files
+    tmp_path = cache.with_suffix(f".{os.getpid()}.tmp")
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, cache)
+
+
+def _district_names(districts: Sequence[Union[District, str]]) -> List[str]:
+    return [DISTRICT_NAMES[d] if isinstance(d, District) else d for d in districts]
+
+
+def _table_from_cache(
+    cache: Path, districts: Optional[List[str]], columns: Optional[List[str]]
+) -> "pa.Table":
+    table = feather.read_table(cache, memory_map=True)
+
+    # Filtering materializes the kept rows, column selection stays zero-copy
+    if districts is not None:
+        table = table.filter(pc.is_in(table["district"], value_set=pa.array(districts)))
+
+    if columns is not None:
+        table = table.select([col for col in columns if col in table.column_names])
+
+    return table
+
+
+def _table_to_pandas(table: "pa.Table", dtype_backend: str) -> pd.DataFrame:
+    if dtype_backend == "pyarrow":
+        # ArrowDtype columns wrap the table's buffers, nothing is copied out of the mmap
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    # Arrow stores the schema's pandas dtypes, so Int64/boolean/string round-trip
+    return table.to_pandas()
+
+
+def _cached_source(listing_type: ListingType, data_dir: str) -> Path:
+    """Combined CSV of a listing type, with its Arrow cache rebuilt if stale"""
+    source = Path(data_dir) / COMBINED_FILES[listing_type]
+    if not source.exists():
+        raise FileNotFoundError(f"Combined listings file does not exist: {source}")
+
+    cache = _cache_path(source)
+    fingerprint = _source_fingerprint(source)
+    if not _cache_is_fresh(cache, fingerprint):
+        _build_cache(source, cache, fingerprint)
+    return cache
+
+
+def load_listings_table(
+    listing_type: ListingType,
+    districts: Optional[Sequence[Union[District, str]]] = None,
+    columns: Optional[List[str]] = None,
+    data_dir: str = COMBINED_DIR,
+) -> "pa.Table":
+    """Load combined cleaned listings as a memory-mapped Arrow table, requires pyarrow
+
+    Without a district filter no column data is read into memory, pages are
+    loaded from the cache file on access.
+    """
+    if pa is None:
+        raise ImportError("load_listings_table requires the 'pyarrow' package")
+
+    cache = _cached_source(listing_type, data_dir)
+    district_names = _district_names(districts) if districts is not None else None
+    return _table_from_cache(cache, district_names, columns)
+
+
+def load_listings(
+    listing_type: ListingType,
+    districts: Optional[Sequence[Union[District, str]]] = None,
+    columns: Optional[List[str]] = None,
+    data_dir: str = COMBINED_DIR,
+    use_cache: bool = True,
+    dtype_backend: str = "numpy_nullable",
+) -> pd.DataFrame:
+    """Load combined cleaned listings with the cleaner's schema applied
+
+    Districts can be given as District members or their cleaned names
+    (e.g. "Praga-Południe"). When pyarrow is installed, the CSV is cached as
+    a memory-mapped Arrow file next to it and rebuilt whenever the CSV changes.
+
+    dtype_backend="numpy_nullable" returns the schema's pandas dtypes, which
+    copies every column out of the cache. dtype_backend="pyarrow" returns
+    ArrowDtype columns backed by the memory-mapped cache instead.
+    """
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f"dtype_backend must be one of {DTYPE_BACKENDS}")
+    if dtype_backend == "pyarrow" and pa is None:
+        raise ImportError("dtype_backend='pyarrow' requires the 'pyarrow' package")
+
+    source = Path(data_dir) / COMBINED_FILES[listing_type]
+    if not source.exists():
+        raise FileNotFoundError(f"Combined listings file does not exist: {source}")
+
+    district_names = _district_names(districts) if districts is not None else None
+
+    if use_cache and pa is not None:
+        cache = _cached_source(listing_type, data_dir)
+        return _table_to_pandas(
+            _table_from_cache(cache, district_names, columns), dtype_backend
+        )
+
+    if use_cache:
+        logger.warning("pyarrow is not installed, loading listings from CSV")
+
+    read_columns = columns
+    if columns is not None and district_names is not None and "district" not in columns:
+        read_columns = [*columns, "district"]
+
+    df = read_clean_csv(source, columns=read_columns)
+    if district_names is not None:
+        df = df[df["district"].isin(district_names)].reset_index(drop=True)
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    if dtype_backend == "pyarrow":
+        df = _table_to_pandas(pa.Table.from_pandas(df, preserve_index=False), dtype_backend)
+    return df
@@ -0,0 +1,127 @@
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAZETTEER: str = "./data/geo/warsaw_gazetteer.csv"
+DEFAULT_METRO_STATIONS: str = "./data/geo/warsaw_metro_stations.csv"
+
+STREET: str = "street"
+NEIGHBORHOOD: str = "neighborhood"
+DISTRICT: str = "district"
+# Precisions from finest to coarsest
+PRECISIONS: Tuple[str, ...] = (STREET, NEIGHBORHOOD, DISTRICT)
+# Typical distance from the geocoded centroid to the actual address
+PRECISION_ERROR_M: Dict[str, float] = {
+    STREET: 250.0,
+    NEIGHBORHOOD: 1000.0,
+    DISTRICT: 3000.0,
+}
+
+Coordinates = Tuple[float, float, str]
+
+_STREET_PREFIX = re.compile(r"^(ul|al|pl|os|rondo)\.?\s+", re.IGNORECASE)
+
+
+def _normalize(name) -> Optional[str]:
+    """Lowercase name without street prefixes, so "ul. Obozowa" matches "Obozowa" """
+    if pd.isna(name):
+        return None
+    name = _STREET_PREFIX.sub("", str(name).strip())
+    return re.sub(r"\s+", " ", name).lower() or None
+
+
+def load_metro_stations(path: str = DEFAULT_METRO_STATIONS) -> pd.DataFrame:
+    """Load metro stations (line, name, lat, lon) for proximity queries"""
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+class Geocoder:
+    """Offline geocoder backed by a local gazetteer CSV
+
+    The gazetteer has columns kind (street/neighborhood/district), district,
+    name, lat, lon. Lookups fall back from street to neighborhood to district
+    centroid, the precision used is reported with every result.
+    """
+
+    def __init__(self, gazetteer_path: str = DEFAULT_GAZETTEER):
+        self.gazetteer_path = Path(gazetteer_path)
+        self._places: Dict[str, Dict[Tuple[Optional[str], ...], Tuple[float, float]]] = {
+            STREET: {},
+            NEIGHBORHOOD: {},
+            DISTRICT: {},
+        }
+        self._cache: Dict[Tuple[Optional[str], ...], Optional[Coordinates]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        gazetteer = pd.read_csv(self.gazetteer_path, encoding="utf-8-sig")
+
+        for row in gazetteer.itertuples(index=False):
+            district = _normalize(row.district)
+            if row.kind == DISTRICT:
+                key = (district,)
+            else:
+                key = (district, _normalize(row.name))
+            self._places[row.kind][key] = (float(row.lat), float(row.lon))
+
+        logger.info(
+            f"Loaded gazetteer {self.gazetteer_path}: "
+            + ", ".join(f"{len(places)} {kind}" for kind, places in self._places.items())
+        )
+        if not self._places[STREET]:
+            logger.warning(
+                f"Gazetteer {self.gazetteer_path} has no street rows, "
+                "coordinates are neighborhood or district centroids at best"
+            )
+
+    def geocode(self, street, neighborhood, district) -> Optional[Coordinates]:
+        """Get (lat, lon, precision) of the most specific known place"""
+        key = (_normalize(street), _normalize(neighborhood), _normalize(district))
+        if key in self._cache:
+            return self._cache[key]
+
+        street_key, neighborhood_key, district_key = key
+        result: Optional[Coordinates] = None
+
+        for kind, place_key in (
+            (STREET, (district_key, street_key)),
+            (NEIGHBORHOOD, (district_key, neighborhood_key)),
+            (DISTRICT, (district_key,)),
+        ):
+            if None in place_key:
+                continue
+            coordinates = self._places[kind].get(place_key)
+            if coordinates is not None:
+                result = (*coordinates, kind)
+                break
+
+        self._cache[key] = result
+        return result
+
+    def attach_coordinates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add lat, lon and geo_precision columns to cleaned listings"""
+        location_columns = ["street", "neighborhood", "district"]
+        for col in location_columns:
+            if col not in df.columns:
+                raise ValueError(f"Cannot geocode, missing column '{col}'")
+
+        # Geocode each distinct location once, then broadcast back to rows
+        locations = df[location_columns].drop_duplicates()
+        geocoded = [self.geocode(*location) for location in locations.itertuples(index=False)]
+        locations = locations.assign(
+            lat=[g[0] if g else None for g in geocoded],
+            lon=[g[1] if g else None for g in geocoded],
+            geo_precision=[g[2] if g else None for g in geocoded],
+        )
+
+        result = df.drop(columns=["lat", "lon", "geo_precision"], errors="ignore")
+        result = result.merge(locations, on=location_columns, how="left")
+        result.index = df.index
+
+        located = result["lat"].notna().sum()
+        logger.info(f"Geocoded {located} of {len(result)} listings")
+        return result
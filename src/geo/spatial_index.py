@@ -0,0 +1,211 @@
+import logging
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .gazetteer import PRECISION_ERROR_M, PRECISIONS
+
+logger = logging.getLogger(__name__)
+
+METERS_PER_DEGREE_LAT: float = 110_540.0
+METERS_PER_DEGREE_LON_EQUATOR: float = 111_320.0
+# Rank of points indexed without a geo_precision, never filtered out
+UNKNOWN_PRECISION: int = -1
+
+
+class SpatialIndex:
+    """Uniform grid index over points for radius and k-nearest queries
+
+    Coordinates are projected to a local metric plane (equirectangular around
+    the data's mean latitude, accurate to well under 1% across a city). Point
+    ids are sorted by grid cell, so every column of cells touching a query
+    circle is one contiguous slice found with two binary searches.
+
+    Points may carry the Geocoder's geo_precision. A district centroid is
+    kilometres off the actual address, so queries can drop points coarser than
+    `max_precision`, and a warning is logged once when results are less
+    precise than the query radius.
+    """
+
+    def __init__(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        cell_size_m: float = 250.0,
+        precision: Optional[Sequence[Optional[str]]] = None,
+    ):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        if lat.shape != lon.shape:
+            raise ValueError("lat and lon must have the same shape")
+        if precision is not None and len(precision) != len(lat):
+            raise ValueError("precision must have one value per point")
+        if cell_size_m <= 0:
+            raise ValueError("cell_size_m must be positive")
+
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        # Positions of indexed points in the input arrays
+        self.positions = np.flatnonzero(valid)
+        self.cell_size_m = cell_size_m
+        self._warned_coarse = False
+
+        # Precision rank per input position, index into PRECISIONS
+        self._precision_rank = np.full(len(lat), UNKNOWN_PRECISION, dtype=np.int8)
+        if precision is not None:
+            ranks = {name: rank for rank, name in enumerate(PRECISIONS)}
+            self._precision_rank[:] = [
+                ranks.get(value, UNKNOWN_PRECISION) for value in precision
+            ]
+
+        self._lat0 = float(np.mean(lat[valid])) if valid.any() else 0.0
+        self._lon0 = float(np.mean(lon[valid])) if valid.any() else 0.0
+        self._lon_scale = METERS_PER_DEGREE_LON_EQUATOR * np.cos(np.radians(self._lat0))
+
+        x, y = self._project(lat[valid], lon[valid])
+        cx = np.floor(x / cell_size_m).astype(np.int64)
+        cy = np.floor(y / cell_size_m).astype(np.int64)
+
+        self._cx_min = int(cx.min()) if len(cx) else 0
+        self._cx_max = int(cx.max()) if len(cx) else 0
+        self._cy_min = int(cy.min()) if len(cy) else 0
+        self._cy_span = int(cy.max()) - self._cy_min + 1 if len(cy) else 1
+
+        keys = self._cell_keys(cx, cy)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._x = np.ascontiguousarray(x[order])
+        self._y = np.ascontiguousarray(y[order])
+        self._ids = self.positions[order]
+        self._ranks = self._precision_rank[self._ids]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cell_size_m: float = 250.0) -> "SpatialIndex":
+        """Build index from a frame with lat/lon columns, query results are row positions
+
+        The geo_precision column is used when present.
+        """
+        precision = df["geo_precision"].tolist() if "geo_precision" in df.columns else None
+        return cls(
+            df["lat"].astype("float64").to_numpy(na_value=np.nan),
+            df["lon"].astype("float64").to_numpy(na_value=np.nan),
+            cell_size_m=cell_size_m,
+            precision=precision,
+        )
+
+    def precision_of(self, positions: np.ndarray) -> np.ndarray:
+        """Get geo_precision of result positions, None where it is unknown"""
+        names = np.array([*PRECISIONS, None], dtype=object)
+        return names[self._precision_rank[np.asarray(positions, dtype=np.int64)]]
+
+    @staticmethod
+    def _max_rank(max_precision: Optional[str]) -> Optional[int]:
+        if max_precision is None:
+            return None
+        if max_precision not in PRECISIONS:
+            raise ValueError(f"max_precision must be one of {PRECISIONS}")
+        return PRECISIONS.index(max_precision)
+
+    def _warn_if_coarse(self, ranks: np.ndarray, distance_m: float) -> None:
+        """Log once when results are located less precisely than the query distance"""
+        if self._warned_coarse or not len(ranks):
+            return
+        coarsest = int(ranks.max())
+        if coarsest == UNKNOWN_PRECISION:
+            return
+        error_m = PRECISION_ERROR_M[PRECISIONS[coarsest]]
+        if error_m > distance_m:
+            self._warned_coarse = True
+            logger.warning(
+                f"Spatial query over {distance_m:.0f} m returned points geocoded at "
+                f"{PRECISIONS[coarsest]} precision (~{error_m:.0f} m off), "
+                f"pass max_precision or filter on geo_precision"
+            )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _project(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        x = (np.asarray(lon) - self._lon0) * self._lon_scale
+        y = (np.asarray(lat) - self._lat0) * METERS_PER_DEGREE_LAT
+        return x, y
+
+    def _cell_keys(self, cx, cy):
+        return (cx - self._cx_min) * self._cy_span + (cy - self._cy_min)
+
+    def _candidates(self, x: float, y: float, radius_m: float) -> np.ndarray:
+        """Sorted-array slices of all cells intersecting the query square"""
+        cx_lo = max(int(np.floor((x - radius_m) / self.cell_size_m)), self._cx_min)
+        cx_hi = min(int(np.floor((x + radius_m) / self.cell_size_m)), self._cx_max)
+        cy_lo = max(int(np.floor((y - radius_m) / self.cell_size_m)), self._cy_min)
+        cy_hi = min(
+            int(np.floor((y + radius_m) / self.cell_size_m)),
+            self._cy_min + self._cy_span - 1,
+        )
+        if cx_lo > cx_hi or cy_lo > cy_hi:
+            return np.empty(0, dtype=np.int64)
+
+        columns = np.arange(cx_lo, cx_hi + 1, dtype=np.int64)
+        starts = np.searchsorted(self._keys, self._cell_keys(columns, cy_lo), "left")
+        ends = np.searchsorted(self._keys, self._cell_keys(columns, cy_hi), "right")
+        slices = [np.arange(s, e) for s, e in zip(starts, ends) if e > s]
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def _query_radius(
+        self, x: float, y: float, radius_m: float, max_rank: Optional[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted-array indices and distances of points within radius_m"""
+        candidates = self._candidates(x, y, radius_m)
+        if max_rank is not None:
+            candidates = candidates[self._ranks[candidates] <= max_rank]
+        distances = np.hypot(self._x[candidates] - x, self._y[candidates] - y)
+
+        inside = distances <= radius_m
+        return candidates[inside], distances[inside]
+
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        sort: bool = False,
+        max_precision: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (positions, distances in m) of points within radius_m of (lat, lon)
+
+        max_precision, e.g. "neighborhood", drops points geocoded more coarsely.
+        """
+        x, y = self._project(lat, lon)
+        candidates, distances = self._query_radius(
+            float(x), float(y), radius_m, self._max_rank(max_precision)
+        )
+        if sort:
+            order = np.argsort(distances)
+            candidates, distances = candidates[order], distances[order]
+
+        self._warn_if_coarse(self._ranks[candidates], radius_m)
+        return self._ids[candidates], distances
+
+    def query_knn(
+        self, lat: float, lon: float, k: int, max_precision: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (positions, distances in m) of the k nearest points, nearest first"""
+        if k < 1:
+            raise ValueError("k must be 1 or greater")
+        max_rank = self._max_rank(max_precision)
+        eligible = len(self) if max_rank is None else int((self._ranks <= max_rank).sum())
+        k = min(k, eligible)
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Grow the search radius until it holds k points; the k-th nearest
+        # within that circle is then the true k-th nearest overall
+        x, y = self._project(lat, lon)
+        radius = self.cell_size_m
+        while True:
+            candidates, distances = self._query_radius(float(x), float(y), radius, max_rank)
+            if len(candidates) >= k:
+                nearest = np.argpartition(distances, k - 1)[:k]
+                nearest = nearest[np.argsort(distances[nearest])]
+                candidates, distances = candidates[nearest], distances[nearest]
+                self._warn_if_coarse(self._ranks[candidates], float(distances[-1]))
+                return self._ids[candidates], distances
+            radius *= 2
@@ -0,0 +1,272 @@
+import bisect
+import json
+import logging
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMN: str = "id"
+OP_COLUMN: str = "_op"
+ADDED: str = "added"
+CHANGED: str = "changed"
+REMOVED: str = "removed"
+
+MANIFEST_FILENAME: str = "manifest.json"
+LATEST_FILENAME: str = "latest.csv"
+CHANGES_INDEX_DIRNAME: str = "changes"
+CHANGES_INDEX_COLUMNS: List[str] = [KEY_COLUMN, "seq", "taken_at", OP_COLUMN, "price"]
+CHANGES_INDEX_PARTITIONS: int = 64
+
+# Fixed types of numeric snapshot columns: an int64 price column in one run and
+# a float64 one (any missing price) in the next must store the same text.
+# Query results are returned with these types.
+SNAPSHOT_DTYPES: Dict[str, str] = {"price": "Int64"}
+
+DEFAULT_CHECKPOINT_INTERVAL: int = 10
+
+
+class SnapshotStore:
+    """Stores successive scrape snapshots of one series as deltas
+
+    Every recorded snapshot is diffed against the previous one by listing ID
+    and only added, changed and removed rows are written. A full checkpoint is
+    written every `checkpoint_interval` snapshots, so "state as of" queries
+    replay at most that many deltas. A change index partitioned by listing ID
+    hash answers history queries by reading one small partition.
+    """
+
+    def __init__(
+        self,
+        store_dir: str,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ):
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be 1 or greater")
+
+        self.store_dir = Path(store_dir)
+        self.checkpoint_interval = checkpoint_interval
+        self.manifest_path = self.store_dir / MANIFEST_FILENAME
+        self.latest_path = self.store_dir / LATEST_FILENAME
+        self.changes_index_dir = self.store_dir / CHANGES_INDEX_DIRNAME
+
+    # Manifest and file layout
+
+    def _load_manifest(self) -> List[Dict[str, Any]]:
+        if not self.manifest_path.exists():
+            return []
+        with open(self.manifest_path, encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+
+    def _save_manifest(self, manifest: List[Dict[str, Any]]) -> None:
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        tmp_path.replace(self.manifest_path)
+
+    def _delta_path(self, seq: int) -> Path:
+        return self.store_dir / "deltas" / f"{seq:06d}.csv"
+
+    def _checkpoint_path(self, seq: int) -> Path:
+        return self.store_dir / "checkpoints" / f"{seq:06d}.csv"
+
+    @staticmethod
+    def _read_csv(path: Path) -> pd.DataFrame:
+        return pd.read_csv(path, dtype="string", keep_default_na=False, na_values=[""])
+
+    @staticmethod
+    def _write_csv(df: pd.DataFrame, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, index=False, encoding="utf-8")
+
+    def snapshots(self) -> pd.DataFrame:
+        """Get summary of all recorded snapshots"""
+        return pd.DataFrame(self._load_manifest())
+
+    # Recording
+
+    @staticmethod
+    def _canonical_text(df: pd.DataFrame) -> pd.DataFrame:
+        """Text form of every value that does not depend on the column dtype"""
+        columns = {}
+        for col in df.columns:
+            values = df[col]
+            if col in SNAPSHOT_DTYPES:
+                values = pd.to_numeric(values, errors="coerce").astype(SNAPSHOT_DTYPES[col])
+            elif pd.api.types.is_float_dtype(values):
+                # 100000.0 and 100000 both become "100000"
+                values = values.map(lambda v: v if pd.isna(v) else f"{v:.15g}")
+            columns[col] = values.astype("string")
+        return pd.DataFrame(columns, index=df.index)
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compare and store snapshots as canonical text, so dtypes can't fake changes"""
+        if KEY_COLUMN not in df.columns:
+            raise ValueError(f"Snapshot must contain '{KEY_COLUMN}' column")
+
+        normalized = self._canonical_text(df)
+        normalized = normalized.drop_duplicates(subset=KEY_COLUMN, keep="last")
+        return normalized.set_index(KEY_COLUMN)
+
+    def _latest_state(self, columns: pd.Index) -> pd.DataFrame:
+        if not self.latest_path.exists():
+            return pd.DataFrame(columns=columns, dtype="string").rename_axis(KEY_COLUMN)
+        return self._read_csv(self.latest_path).set_index(KEY_COLUMN)
+
+    @staticmethod
+    def _typed(df: pd.DataFrame) -> pd.DataFrame:
+        """Stored text back to SNAPSHOT_DTYPES, other columns stay strings"""
+        columns = {
+            col: pd.to_numeric(df[col], errors="coerce").astype(dtype)
+            for col, dtype in SNAPSHOT_DTYPES.items()
+            if col in df.columns
+        }
+        return df.assign(**columns)
+
+    @staticmethod
+    def _row_hashes(df: pd.DataFrame) -> pd.Series:
+        return pd.util.hash_pandas_object(df, index=False)
+
+    def record(self, snapshot: pd.DataFrame, taken_at: Optional[str] = None) -> Dict[str, Any]:
+        """Record one snapshot as a delta against the previous one"""
+        manifest = self._load_manifest()
+        taken_at = taken_at or datetime.now().isoformat(timespec="seconds")
+        if manifest and taken_at <= manifest[-1]["taken_at"]:
+            raise ValueError(
+                f"Snapshot time {taken_at} is not after last snapshot "
+                f"{manifest[-1]['taken_at']}"
+            )
+
+        current = self._normalize(snapshot)
+        previous = self._latest_state(current.columns)
+        previous = previous.reindex(columns=current.columns)
+
+        added_ids = current.index.difference(previous.index)
+        removed_ids = previous.index.difference(current.index)
+        common_ids = current.index.intersection(previous.index)
+        current_hashes = self._row_hashes(current.loc[common_ids])
+        previous_hashes = self._row_hashes(previous.loc[common_ids])
+        changed_ids = common_ids[current_hashes.values != previous_hashes.values]
+
+        delta = pd.concat(
+            [
+                current.loc[added_ids].assign(**{OP_COLUMN: ADDED}),
+                current.loc[changed_ids].assign(**{OP_COLUMN: CHANGED}),
+                previous.loc[removed_ids].assign(**{OP_COLUMN: REMOVED}),
+            ]
+        ).reset_index()
+
+        seq = len(manifest) + 1
+        is_checkpoint = seq == 1 or seq % self.checkpoint_interval == 0
+
+        self._write_csv(delta, self._delta_path(seq))
+        if is_checkpoint:
+            self._write_csv(current.reset_index(), self._checkpoint_path(seq))
+        self._append_changes_index(delta, seq, taken_at)
+        self._write_csv(current.reset_index(), self.latest_path)
+
+        entry = {
+            "seq": seq,
+            "taken_at": taken_at,
+            "listings": len(current),
+            ADDED: len(added_ids),
+            CHANGED: len(changed_ids),
+            REMOVED: len(removed_ids),
+            "checkpoint": is_checkpoint,
+        }
+        manifest.append(entry)
+        self._save_manifest(manifest)
+
+        logger.info(
+            f"Recorded snapshot {seq} in {self.store_dir}: "
+            f"+{entry[ADDED]} ~{entry[CHANGED]} -{entry[REMOVED]}"
+        )
+        return entry
+
+    @staticmethod
+    def _partition_of(listing_ids: pd.Series) -> pd.Series:
+        return listing_ids.map(
+            lambda listing_id: zlib.crc32(str(listing_id).encode("utf-8"))
+            % CHANGES_INDEX_PARTITIONS
+        )
+
+    def _partition_path(self, partition: int) -> Path:
+        return self.changes_index_dir / f"{partition:02d}.csv"
+
+    def _write_changes(self, rows: pd.DataFrame) -> None:
+        """Append change rows to the partition of their listing ID"""
+        self.changes_index_dir.mkdir(parents=True, exist_ok=True)
+        for partition, part in rows.groupby(self._partition_of(rows[KEY_COLUMN])):
+            path = self._partition_path(partition)
+            part[CHANGES_INDEX_COLUMNS].to_csv(
+                path, mode="a", header=not path.exists(), index=False, encoding="utf-8"
+            )
+
+    def _append_changes_index(self, delta: pd.DataFrame, seq: int, taken_at: str) -> None:
+        rows = delta.reindex(columns=[KEY_COLUMN, OP_COLUMN, "price"]).assign(
+            seq=seq, taken_at=taken_at
+        )[CHANGES_INDEX_COLUMNS]
+        self._write_changes(rows)
+
+    # Queries
+
+    def state_as_of(self, as_of: str) -> pd.DataFrame:
+        """Get listings as they were in the last snapshot taken at or before as_of"""
+        manifest = self._load_manifest()
+        times = [entry["taken_at"] for entry in manifest]
+        position = bisect.bisect_right(times, as_of)
+        if position == 0:
+            return pd.DataFrame(columns=[KEY_COLUMN], dtype="string")
+
+        target_seq = manifest[position - 1]["seq"]
+        checkpoint_seq = max(
+            entry["seq"]
+            for entry in manifest[:position]
+            if entry["checkpoint"]
+        )
+
+        state = self._read_csv(self._checkpoint_path(checkpoint_seq)).set_index(KEY_COLUMN)
+        for seq in range(checkpoint_seq + 1, target_seq + 1):
+            state = self._apply_delta(state, self._read_csv(self._delta_path(seq)))
+
+        return self._typed(state.reset_index())
+
+    @staticmethod
+    def _apply_delta(state: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        delta = delta.set_index(KEY_COLUMN)
+        ops = delta.pop(OP_COLUMN)
+
+        state = state.drop(index=ops.index[ops == REMOVED], errors="ignore")
+        upserts = delta[ops != REMOVED].reindex(columns=state.columns)
+        state = state.drop(index=upserts.index, errors="ignore")
+        return pd.concat([state, upserts])
+
+    def _changes_for(self, listing_id: str) -> pd.DataFrame:
+        """Change rows of one listing, reading only its partition"""
+        partition = self._partition_of(pd.Series([str(listing_id)])).iloc[0]
+        path = self._partition_path(partition)
+        if not path.exists():
+            return pd.DataFrame(columns=CHANGES_INDEX_COLUMNS, dtype="string")
+        changes = self._read_csv(path)
+        return changes[changes[KEY_COLUMN] == str(listing_id)]
+
+    def price_history(self, listing_id: str) -> pd.DataFrame:
+        """Get price changes of one listing, straight from the change index"""
+        changes = self._changes_for(listing_id)
+        return self._typed(changes[["taken_at", OP_COLUMN, "price"]].reset_index(drop=True))
+
+    def listing_history(self, listing_id: str) -> pd.DataFrame:
+        """Get every recorded version of one listing, reading only its deltas"""
+        changes = self._changes_for(listing_id)
+        versions = []
+        for seq, taken_at in zip(changes["seq"].astype(int), changes["taken_at"]):
+            delta = self._read_csv(self._delta_path(seq))
+            row = delta[delta[KEY_COLUMN] == str(listing_id)]
+            versions.append(row.assign(taken_at=taken_at))
+
+        if not versions:
+            return pd.DataFrame(columns=[KEY_COLUMN, OP_COLUMN, "taken_at"])
+        return self._typed(pd.concat(versions, ignore_index=True))
@@ -1,13 +1,16 @@
-from dataclasses import dataclass, field
-from datetime import datetime
-import random
+from dataclasses import dataclass
+import hashlib
+import re
 from typing import Optional
 
+# Otodom detail URLs end with the ad identifier, e.g. ".../oferta/slug-ID4xFnX"
+AD_ID_PATTERN = re.compile(r"-ID([0-9A-Za-z]+)(?=[/?#]|$)")
 
-@dataclass
+
+@dataclass(slots=True)
 class Property:
     link: str
-    id: str = field(default_factory=lambda: Property._generate_smart_id())
+    id: Optional[str] = None
 
     # Basic info
     price: Optional[int] = None
@@ -34,10 +37,16 @@ class Property:
     # Additional features
     additional_features: Optional[str] = None
 
+    def __post_init__(self):
+        if self.id is None:
+            self.id = Property.listing_id_from_link(self.link)
+
     @staticmethod
-    def _generate_smart_id() -> str:
-        now = datetime.now()
-        # date_part = now.strftime("%Y%m%d")
-        time_part = now.strftime("%H%M%S")
-        random_part = random.randint(100, 999)
-        return f"{random_part}{time_part}"
+    def listing_id_from_link(link: str) -> str:
+        """Derive a stable listing ID from the otodom ad identifier in the URL"""
+        match = AD_ID_PATTERN.search(link)
+        if match:
+            return match.group(1)
+
+        # Not an otodom ad URL - a digest of the link is still stable across runs
+        return hashlib.sha1(link.encode("utf-8")).hexdigest()[:12]
@@ -0,0 +1,66 @@
+from dataclasses import fields
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+from .property import Property
+
+PROPERTY_FIELDS: List[str] = [field.name for field in fields(Property)]
+
+
+class PropertyBatch:
+    """Column-oriented batch of Property records
+
+    Values are appended straight into per-column lists, so converting the
+    batch to a DataFrame or Arrow table skips the per-row dict step.
+    """
+
+    def __init__(self, properties: Optional[Iterable[Property]] = None):
+        self._columns: Dict[str, List[Any]] = {name: [] for name in PROPERTY_FIELDS}
+        self._get_values = attrgetter(*PROPERTY_FIELDS)
+        if properties is not None:
+            self.extend(properties)
+
+    def append(self, prop: Property) -> None:
+        """Append one Property, column by column"""
+        for column, value in zip(self._columns.values(), self._get_values(prop)):
+            column.append(value)
+
+    def append_fields(self, link: str, **values: Any) -> None:
+        """Append one record without building a Property object first"""
+        unknown = set(values) - set(PROPERTY_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown property fields: {sorted(unknown)}")
+
+        values["link"] = link
+        if values.get("id") is None:
+            values["id"] = Property.listing_id_from_link(link)
+
+        for name, column in self._columns.items():
+            column.append(values.get(name))
+
+    def extend(self, properties: Iterable[Property]) -> None:
+        """Append many Property objects"""
+        for prop in properties:
+            self.append(prop)
+
+    def column(self, name: str) -> List[Any]:
+        """Get all values of one field"""
+        return self._columns[name]
+
+    def clear(self) -> None:
+        """Drop all records, keeping the column layout"""
+        for column in self._columns.values():
+            column.clear()
+
+    def __len__(self) -> int:
+        return len(self._columns["link"])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert batch to DataFrame, columns in Property field order"""
+        return pd.DataFrame(self._columns, columns=PROPERTY_FIELDS)
+
+    def to_arrow(self):
+        """Convert batch to pyarrow Table (requires the optional pyarrow package)"""
+        import pyarrow as pa
+
+        return pa.table(self._columns)
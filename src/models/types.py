@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Literal
+from typing import Dict, Literal
 
 SortDirection = Literal["DESC", "ASC"]
 
@@ -23,6 +23,29 @@ class District(Enum):
     WESOLA = "mazowieckie/warszawa/warszawa/warszawa/wesola"
     WILANOW = "mazowieckie/warszawa/warszawa/warszawa/wilanow"
     WLOCHY = "mazowieckie/warszawa/warszawa/warszawa/wlochy"
+
+
+# District names as they appear in the cleaned "district" column
+DISTRICT_NAMES: Dict[District, str] = {
+    District.SRODMIESCIE: "Śródmieście",
+    District.MOKOTOW: "Mokotów",
+    District.OCHOTA: "Ochota",
+    District.WOLA: "Wola",
+    District.ZOLIBORZ: "Żoliborz",
+    District.PRAGA_POLUDNIE: "Praga-Południe",
+    District.PRAGA_POLNOC: "Praga-Północ",
+    District.BEMOWO: "Bemowo",
+    District.BIALOLEKA: "Białołęka",
+    District.BIELANY: "Bielany",
+    District.REMBERTOW: "Rembertów",
+    District.TARGOWEK: "Targówek",
+    District.URSUS: "Ursus",
+    District.URSYNOW: "Ursynów",
+    District.WAWER: "Wawer",
+    District.WESOLA: "Wesoła",
+    District.WILANOW: "Wilanów",
+    District.WLOCHY: "Włochy",
+}
                 
 
 class ResultLimit(Enum):
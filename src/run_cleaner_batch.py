@@ -3,6 +3,7 @@ from pathlib import Path
 
 from .cleaner.batch_cleaner import BatchCleaner
 from .cleaner.property_cleaner import PropertyDataCleaner
+from .geo.gazetteer import Geocoder
 
 
 logging.basicConfig(
@@ -11,23 +12,29 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# The shipped gazetteer has no street rows yet, so coordinates would only be
+# neighborhood/district centroids. Enable once street-level data is in place.
+GEOCODE: bool = False
+
 
 def main():
     """Main function to run the data cleaning process"""
 
     logger.info("Starting property data cleaning...")
 
-    property_cleaner = PropertyDataCleaner()
+    property_cleaner = PropertyDataCleaner(geocoder=Geocoder() if GEOCODE else None)
     batch_cleaner = BatchCleaner(
         property_cleaner=property_cleaner,
         raw_dir="./data/raw",
         clean_dir="./data/clean",
+        quarantine_dir="./data/quarantine",
     )
 
     batch_cleaner.clean_all_files()
 
     logger.info("Data cleaning completed!")
     logger.info("Check ./data/clean/rents/ and ./data/clean/sales/ for results")
+    logger.info("Rows failing data quality rules are in ./data/quarantine/")
 
     clean_rents_dir = Path("./data/clean/rents")
     clean_sales_dir = Path("./data/clean/sales")
@@ -41,6 +48,9 @@ def main():
         clean_sales_dir, combined_output_dir / "warsaw_all_sales.csv"
     )
 
+    batch_cleaner.mark_duplicates(combined_output_dir / "warsaw_all_rents.csv")
+    batch_cleaner.mark_duplicates(combined_output_dir / "warsaw_all_sales.csv")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,110 @@
+import logging
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List, Optional
+from .cleaner.batch_cleaner import BatchCleaner
+from .cleaner.property_cleaner import PropertyDataCleaner
+from .cleaner.stream_cleaner import StreamingCleaner
+from .geo.gazetteer import Geocoder
+from .scraper.archive import PageArchive
+from .scraper.batch_scraper import BatchScraper
+from .scraper.pipeline import FetchParsePipeline
+from .scraper.transport import HttpTransport
+from .models.types import District, ListingType, ResultLimit
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+WARSAW_DISTRICTS: List[District] = list(District)
+LISTING_TYPES: List[ListingType] = list(ListingType)
+MAX_PROPERTIES: int = 500
+FETCH_WORKERS: int = 8
+# None = one parser process per CPU core, 0 = parse on the fetch threads
+PARSE_WORKERS: Optional[int] = None
+POOL_SIZE: int = 16
+HTTP2: bool = False
+# One detail-page queue across all combinations instead of one combination at a time
+GLOBAL_SCHEDULER: bool = True
+CRAWL_WORKERS: int = 2
+ARCHIVE_DIR: Optional[str] = None
+HISTORY_DIR: Optional[str] = "./data/history"
+# Raw CSVs are an optional side channel here, set to "./data/raw" to keep them
+RAW_DIR: Optional[str] = None
+CLEAN_DIR: str = "./data/clean"
+QUARANTINE_DIR: Optional[str] = "./data/quarantine"
+# Centroid-only until the gazetteer has street rows, see run_cleaner_batch
+GEOCODE: bool = False
+MICRO_BATCH_SIZE: int = 100
+MAX_BATCH_DELAY_SECONDS: float = 5.0
+
+
+def main():
+    """Scrape and clean in one process, streaming clean records to the clean store"""
+    logger.info("Starting streaming scrape-to-clean pipeline...")
+
+    with ExitStack() as stack:
+        transport = stack.enter_context(HttpTransport(pool_size=POOL_SIZE, http2=HTTP2))
+        archive = (
+            stack.enter_context(PageArchive(ARCHIVE_DIR)) if ARCHIVE_DIR else None
+        )
+        pipeline = stack.enter_context(
+            FetchParsePipeline(fetch_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS)
+        )
+        property_cleaner = PropertyDataCleaner(geocoder=Geocoder() if GEOCODE else None)
+        sink = stack.enter_context(
+            StreamingCleaner(
+                property_cleaner,
+                clean_dir=CLEAN_DIR,
+                quarantine_dir=QUARANTINE_DIR,
+                batch_size=MICRO_BATCH_SIZE,
+                max_delay_seconds=MAX_BATCH_DELAY_SECONDS,
+            )
+        )
+        batch_scraper = stack.enter_context(
+            BatchScraper(
+                base_output_dir=RAW_DIR,
+                transport=transport,
+                max_workers=FETCH_WORKERS,
+                archive=archive,
+                pipeline=pipeline,
+                history_dir=HISTORY_DIR,
+                sink=sink,
+            )
+        )
+
+        if GLOBAL_SCHEDULER:
+            total_scraped = batch_scraper.scrape_scheduled(
+                districts=WARSAW_DISTRICTS,
+                listing_types=LISTING_TYPES,
+                limit=ResultLimit.XLARGE,
+                max_properties=MAX_PROPERTIES,
+                crawl_workers=CRAWL_WORKERS,
+            )
+        else:
+            total_scraped = batch_scraper.scrape_multiple_combinations(
+                districts=WARSAW_DISTRICTS,
+                listing_types=LISTING_TYPES,
+                limit=ResultLimit.XLARGE,
+                max_properties=MAX_PROPERTIES,
+                delay_seconds=10,
+            )
+
+    logger.info(f"Pipeline completed! Total properties: {total_scraped}")
+
+    # Cross-district outputs still need the whole run
+    batch_cleaner = BatchCleaner(property_cleaner=property_cleaner, clean_dir=CLEAN_DIR)
+    clean_dir = Path(CLEAN_DIR)
+    combined_output_dir = clean_dir / "combined"
+    combined_output_dir.mkdir(parents=True, exist_ok=True)
+
+    for listing_type in ["rents", "sales"]:
+        combined_path = combined_output_dir / f"warsaw_all_{listing_type}.csv"
+        batch_cleaner.combine_csv_files(clean_dir / listing_type, combined_path)
+        batch_cleaner.mark_duplicates(combined_path)
+
+
+if __name__ == "__main__":
+    main()
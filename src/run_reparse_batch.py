@@ -0,0 +1,38 @@
+import logging
+from typing import Optional
+from .scraper.archive import PageArchive
+from .scraper.batch_reparser import BatchReparser
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR: str = "./data/archive"
+OUTPUT_DIR: str = "./data/reparsed"
+# Archive segment of the run to rebuild, e.g. "pages-20250630-021500-4242.zst",
+# None picks the last run started at or before AS_OF
+RUN: Optional[str] = None
+# ISO timestamp, e.g. "2025-06-30T23:59:59", None means the latest run
+AS_OF: Optional[str] = None
+# Same cap per district and listing type as the scrape that filled the archive
+MAX_PROPERTIES: Optional[int] = 500
+
+
+def main():
+    """Rebuild raw property CSVs from archived pages, without network access"""
+    logger.info("Starting offline re-parse...")
+
+    with PageArchive(ARCHIVE_DIR) as archive:
+        batch_reparser = BatchReparser(archive=archive, base_output_dir=OUTPUT_DIR)
+        total_reparsed = batch_reparser.reparse_all(
+            run=RUN, as_of=AS_OF, max_properties=MAX_PROPERTIES
+        )
+
+    logger.info(f"Re-parse completed! Total properties: {total_reparsed}")
+    logger.info(f"Check {OUTPUT_DIR}/sales/ and {OUTPUT_DIR}/rents/ for results")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 import logging
-from typing import List
+from contextlib import ExitStack
+from typing import List, Optional
+from .scraper.archive import PageArchive
 from .scraper.batch_scraper import BatchScraper
+from .scraper.pipeline import FetchParsePipeline
+from .scraper.transport import HttpTransport
 from .models.types import District, ListingType, ResultLimit
 
 logging.basicConfig(
@@ -12,21 +16,57 @@ logger = logging.getLogger(__name__)
 WARSAW_DISTRICTS: List[District] = list(District)
 LISTING_TYPES: List[ListingType] = list(ListingType)
 MAX_PROPERTIES: int = 500
+FETCH_WORKERS: int = 8
+# None = one parser process per CPU core, 0 = parse on the fetch threads
+PARSE_WORKERS: Optional[int] = None
+POOL_SIZE: int = 16
+HTTP2: bool = False
+# One detail-page queue across all combinations instead of one combination at a time
+GLOBAL_SCHEDULER: bool = True
+CRAWL_WORKERS: int = 2
+# Set to e.g. "./data/archive" to keep every fetched page for offline re-parse
+ARCHIVE_DIR: Optional[str] = None
+HISTORY_DIR: Optional[str] = "./data/history"
 
 
 def main():
     """Main scraping function - orchestrates the entire scraping process"""
     logger.info("Starting property scraping...")
 
-    batch_scraper = BatchScraper()
+    with ExitStack() as stack:
+        transport = stack.enter_context(HttpTransport(pool_size=POOL_SIZE, http2=HTTP2))
+        archive = (
+            stack.enter_context(PageArchive(ARCHIVE_DIR)) if ARCHIVE_DIR else None
+        )
+        pipeline = stack.enter_context(
+            FetchParsePipeline(fetch_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS)
+        )
+        batch_scraper = stack.enter_context(
+            BatchScraper(
+                transport=transport,
+                max_workers=FETCH_WORKERS,
+                archive=archive,
+                pipeline=pipeline,
+                history_dir=HISTORY_DIR,
+            )
+        )
 
-    total_scraped = batch_scraper.scrape_multiple_combinations(
-        districts=WARSAW_DISTRICTS,
-        listing_types=LISTING_TYPES,
-        limit=ResultLimit.XLARGE,
-        max_properties=MAX_PROPERTIES,
-        delay_seconds=10,
-    )
+        if GLOBAL_SCHEDULER:
+            total_scraped = batch_scraper.scrape_scheduled(
+                districts=WARSAW_DISTRICTS,
+                listing_types=LISTING_TYPES,
+                limit=ResultLimit.XLARGE,
+                max_properties=MAX_PROPERTIES,
+                crawl_workers=CRAWL_WORKERS,
+            )
+        else:
+            total_scraped = batch_scraper.scrape_multiple_combinations(
+                districts=WARSAW_DISTRICTS,
+                listing_types=LISTING_TYPES,
+                limit=ResultLimit.XLARGE,
+                max_properties=MAX_PROPERTIES,
+                delay_seconds=10,
+            )
 
     logger.info(f"Scraping completed! Total properties: {total_scraped}")
     logger.info("Check ./data/raw/sales/ and ./data/raw/rents/ for results")
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed when archiving
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME: str = "index.jsonl"
+SEGMENT_SUFFIX: str = ".zst"
+DETAIL_PAGE: str = "detail"
+LIST_PAGE: str = "list"
+
+
+@dataclass
+class ArchiveEntry:
+    """Index row pointing at one compressed page inside a segment file"""
+
+    url: str
+    fetched_at: str
+    segment: str
+    offset: int
+    length: int
+    status: int = 200
+    kind: str = DETAIL_PAGE
+    tags: Dict[str, str] = field(default_factory=dict)
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImportError(
+            "Page archive requires the 'zstandard' package (pip install zstandard)"
+        )
+
+
+def read_record(segment_path: str, offset: int, length: int) -> bytes:
+    """Read and decompress one page body from a segment file"""
+    _require_zstandard()
+
+    with open(segment_path, "rb") as segment:
+        segment.seek(offset)
+        frame = segment.read(length)
+
+    record = zstandard.ZstdDecompressor().decompress(frame)
+    # Each record is "<json header>\n<body>", the header is only for recovery
+    _, body = record.split(b"\n", 1)
+    return body
+
+
+class PageArchive:
+    """Append-only, zstd-compressed store of fetched pages indexed by URL and time"""
+
+    def __init__(self, archive_dir: str = "./data/archive", compression_level: int = 3):
+        _require_zstandard()
+
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.archive_dir / INDEX_FILENAME
+
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._lock = threading.Lock()
+        self._segment_name: Optional[str] = None
+        self._segment_file = None
+        self._index_file = None
+
+    def _open_for_append(self) -> None:
+        """Lazily start a new segment, so read-only use never creates files"""
+        if self._segment_file is not None:
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._segment_name = f"pages-{timestamp}-{os.getpid()}{SEGMENT_SUFFIX}"
+        self._segment_file = open(self.archive_dir / self._segment_name, "ab")
+        self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+    def write(
+        self,
+        url: str,
+        content: bytes,
+        status: int = 200,
+        kind: str = DETAIL_PAGE,
+        tags: Optional[Dict[str, str]] = None,
+    ) -> ArchiveEntry:
+        """Append one fetched page to the archive"""
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        header = json.dumps({"url": url, "fetched_at": fetched_at, "status": status})
+        frame = self._compressor.compress(header.encode("utf-8") + b"\n" + content)
+
+        with self._lock:
+            self._open_for_append()
+            offset = self._segment_file.tell()
+            self._segment_file.write(frame)
+            self._segment_file.flush()
+
+            entry = ArchiveEntry(
+                url=url,
+                fetched_at=fetched_at,
+                segment=self._segment_name,
+                offset=offset,
+                length=len(frame),
+                status=status,
+                kind=kind,
+                tags=tags or {},
+            )
+            self._index_file.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            self._index_file.flush()
+
+        return entry
+
+    def iter_index(self) -> Iterator[ArchiveEntry]:
+        """Iterate over all index entries in append order"""
+        if not self.index_path.exists():
+            return
+
+        with open(self.index_path, encoding="utf-8") as index_file:
+            for line in index_file:
+                if line.strip():
+                    yield ArchiveEntry(**json.loads(line))
+
+    def latest_entries(
+        self,
+        predicate: Optional[Callable[[ArchiveEntry], bool]] = None,
+        as_of: Optional[str] = None,
+    ) -> List[ArchiveEntry]:
+        """Get the newest entry per URL, optionally only those fetched up to as_of"""
+        latest: Dict[str, ArchiveEntry] = {}
+
+        for entry in self.iter_index():
+            if as_of is not None and entry.fetched_at > as_of:
+                continue
+            if predicate is not None and not predicate(entry):
+                continue
+            latest[entry.url] = entry
+
+        return list(latest.values())
+
+    def runs(self) -> List[Tuple[str, str]]:
+        """Get (segment, first fetched_at) of every run, oldest first
+
+        Each writer opens its own segment, so a segment holds exactly one run.
+        """
+        started: Dict[str, str] = {}
+        for entry in self.iter_index():
+            if entry.segment not in started or entry.fetched_at < started[entry.segment]:
+                started[entry.segment] = entry.fetched_at
+        return sorted(started.items(), key=lambda run: (run[1], run[0]))
+
+    def lookup(self, url: str, as_of: Optional[str] = None) -> Optional[ArchiveEntry]:
+        """Find the newest archived fetch of a URL"""
+        entries = self.latest_entries(lambda entry: entry.url == url, as_of=as_of)
+        return entries[0] if entries else None
+
+    def segment_path(self, entry: ArchiveEntry) -> str:
+        """Get the full path of the segment holding given entry"""
+        return str(self.archive_dir / entry.segment)
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        """Read page body for given index entry"""
+        return read_record(self.segment_path(entry), entry.offset, entry.length)
+
+    def close(self) -> None:
+        """Close the segment and index files of the current run"""
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._index_file.close()
+                self._segment_file = None
+                self._index_file = None
+
+    def __enter__(self) -> "PageArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
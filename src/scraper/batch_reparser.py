@@ -0,0 +1,141 @@
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from ..models.property import Property
+from ..models.types import District, ListingType
+from .archive import DETAIL_PAGE, LIST_PAGE, ArchiveEntry, PageArchive, read_record
+from .property_parser import parse_listing_links, parse_property_page
+from .raw_store import write_raw_csv
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[District, ListingType]
+
+
+def _reparse_entry(task: Tuple[str, str, int, int]) -> Optional[Property]:
+    """Worker-process job: decompress one archived page and parse it"""
+    url, segment_path, offset, length = task
+    try:
+        return parse_property_page(url, read_record(segment_path, offset, length))
+    except Exception as e:
+        logger.error(f"Failed to re-parse {url}: {e}")
+        return None
+
+
+def _series_key(entry: ArchiveEntry) -> Optional[SeriesKey]:
+    district = entry.tags.get("district")
+    listing_type = entry.tags.get("listing_type")
+    if district is None or listing_type is None:
+        return None
+    return District[district], ListingType[listing_type]
+
+
+class BatchReparser:
+    """Rebuilds raw Property CSVs from the page archive without any network access"""
+
+    def __init__(
+        self,
+        archive: PageArchive,
+        base_output_dir: str = "./data/reparsed",
+        max_workers: Optional[int] = None,
+    ):
+        self.archive = archive
+        self.base_output_dir = base_output_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def select_run(self, run: Optional[str] = None, as_of: Optional[str] = None) -> str:
+        """Pick the archived run to rebuild: given segment, last one started by as_of, or latest"""
+        runs = self.archive.runs()
+        if run is not None:
+            if run not in {segment for segment, _ in runs}:
+                raise ValueError(f"No archived run {run} in {self.archive.archive_dir}")
+            return run
+
+        if as_of is not None:
+            runs = [(segment, started) for segment, started in runs if started <= as_of]
+        if not runs:
+            raise ValueError(f"No archived run started by {as_of or 'now'}")
+        return runs[-1][0]
+
+    def _group_detail_pages(self, run: str) -> Dict[SeriesKey, List[ArchiveEntry]]:
+        """Group successful detail pages of one run by district and listing type
+
+        Pages are ordered as their links appeared on the run's list pages, the
+        order the scrape kept them in before applying max_properties.
+        """
+        run_entries = [entry for entry in self.archive.iter_index() if entry.segment == run]
+
+        link_order: Dict[SeriesKey, Dict[str, int]] = defaultdict(dict)
+        for entry in run_entries:
+            if entry.kind != LIST_PAGE or entry.status != 200:
+                continue
+            key = _series_key(entry)
+            if key is None:
+                continue
+            order = link_order[key]
+            for link in parse_listing_links(entry.url, self.archive.read(entry)):
+                order.setdefault(link, len(order))
+
+        groups: Dict[SeriesKey, Dict[str, ArchiveEntry]] = defaultdict(dict)
+        skipped = 0
+        for entry in run_entries:
+            if entry.kind != DETAIL_PAGE or entry.status != 200:
+                continue
+            key = _series_key(entry)
+            if key is None:
+                skipped += 1
+                continue
+            groups[key][entry.url] = entry
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} pages without district/listing type tags")
+
+        ordered: Dict[SeriesKey, List[ArchiveEntry]] = {}
+        for key, entries in groups.items():
+            order = link_order.get(key, {})
+            # Detail pages missing from the list pages keep archive order, after the rest
+            ordered[key] = sorted(
+                entries.values(), key=lambda entry: order.get(entry.url, len(order))
+            )
+        return ordered
+
+    def reparse_all(
+        self,
+        run: Optional[str] = None,
+        as_of: Optional[str] = None,
+        max_properties: Optional[int] = None,
+    ) -> int:
+        """Re-parse the detail pages of one archived run across all CPU cores
+
+        max_properties caps each combination the same way the scrape did, so
+        the output matches the raw CSVs that run wrote.
+        """
+        run = self.select_run(run=run, as_of=as_of)
+        logger.info(f"Re-parsing archived run {run}")
+
+        groups = self._group_detail_pages(run)
+        total = 0
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for (district, listing_type), entries in groups.items():
+                tasks = [
+                    (
+                        entry.url,
+                        self.archive.segment_path(entry),
+                        entry.offset,
+                        entry.length,
+                    )
+                    for entry in entries
+                ]
+                chunksize = max(1, len(tasks) // (self.max_workers * 4))
+                results = executor.map(_reparse_entry, tasks, chunksize=chunksize)
+
+                properties = [prop for prop in results if prop is not None]
+                properties = properties[:max_properties]
+                write_raw_csv(properties, self.base_output_dir, district, listing_type)
+                total += len(properties)
+
+        logger.info(f"Re-parsed {total} properties with {self.max_workers} workers")
+        return total
@@ -1,10 +1,18 @@
 import logging
+from typing import Dict, List, Optional
 import pandas as pd
-import os
-from typing import List
+from ..cleaner.stream_cleaner import StreamingCleaner
+from ..history.snapshot_store import SnapshotStore
 from ..models.property import Property
-from .property_scraper import PropertyScraper
-from .search_params import PropertySearchQuery
+from ..models.property_batch import PropertyBatch
+from .archive import PageArchive
+from .listing_index import ListingIndex
+from .pipeline import FetchParsePipeline
+from .property_scraper import PageCallback, PropertyScraper
+from .raw_store import raw_output_directory, write_raw_csv
+from .scheduler import DEFAULT_CRAWL_WORKERS, CrawlJob, DetailScheduler
+from .search_params import BASE_URL as SEARCH_BASE_URL, PropertySearchQuery
+from .transport import DEFAULT_POOL_SIZE, HttpTransport
 from ..models.types import District, ListingType, ResultLimit
 
 logger = logging.getLogger(__name__)
@@ -13,18 +21,60 @@ logger = logging.getLogger(__name__)
 class BatchScraper:
     """Handles batch scraping operations for multiple districts and listing types"""
 
-    def __init__(self, base_output_dir: str = "./data/raw"):
+    def __init__(
+        self,
+        base_output_dir: Optional[str] = "./data/raw",
+        transport: Optional[HttpTransport] = None,
+        max_workers: int = 5,
+        archive: Optional[PageArchive] = None,
+        pipeline: Optional[FetchParsePipeline] = None,
+        history_dir: Optional[str] = None,
+        sink: Optional[StreamingCleaner] = None,
+        search_base_url: str = SEARCH_BASE_URL,
+    ):
+        # None skips raw CSVs, e.g. when a sink streams clean records instead
         self.base_output_dir = base_output_dir
+        # Raw CSVs are overwritten each run, history keeps every run as a delta.
+        # One store per listing type, recorded once all combinations of a batch are done:
+        # a listing may be claimed by a different district from run to run
+        self.history_dir = history_dir
+        self._history_frames: Dict[ListingType, List[pd.DataFrame]] = {}
+        self._history_gaps: Dict[ListingType, List[District]] = {}
+        self.max_workers = max_workers
+        self.archive = archive
+        self.sink = sink
+        self.search_base_url = search_base_url
+        # One pooled transport shared by every combination keeps connections alive
+        self.transport = transport or HttpTransport(
+            pool_size=max(DEFAULT_POOL_SIZE, max_workers)
+        )
+        self._pipeline = pipeline
+        # close() only shuts down what this scraper created, passed-in ones belong to the caller
+        self._owns_transport = transport is None
+        self._owns_pipeline = pipeline is None
+
+    @property
+    def pipeline(self) -> FetchParsePipeline:
+        """Shared fetch/parse pipeline, parser processes outlive single combinations"""
+        if self._pipeline is None:
+            self._pipeline = FetchParsePipeline(fetch_workers=self.max_workers)
+        return self._pipeline
 
-    def get_output_directory(self, listing_type: ListingType) -> str:
+    def get_output_directory(
+        self, listing_type: ListingType, base_dir: Optional[str] = None
+    ) -> str:
         """Get output directory based on listing type"""
+        return raw_output_directory(base_dir or self.base_output_dir, listing_type)
 
-        if listing_type == ListingType.SALE:
-            return os.path.join(self.base_output_dir, "sales")
-        elif listing_type == ListingType.RENT:
-            return os.path.join(self.base_output_dir, "rents")
-        else:
-            return os.path.join(self.base_output_dir, listing_type.name.lower())
+    def _search_query(
+        self, district: District, listing_type: ListingType, limit: ResultLimit
+    ) -> PropertySearchQuery:
+        return PropertySearchQuery(
+            locations=[district],
+            listing_type=listing_type,
+            limit=limit,
+            base_url=self.search_base_url,
+        )
 
     def scrape_district_type(
         self,
@@ -32,23 +82,32 @@ class BatchScraper:
         listing_type: ListingType,
         limit: ResultLimit,
         max_properties: int,
+        listing_index: Optional[ListingIndex] = None,
     ) -> int:
         """Scrape one district-property type combination"""
 
         logger.info(f"Scraping {district.name} - {listing_type.name}")
 
         try:
-            config = PropertySearchQuery(
-                locations=[district],
-                listing_type=listing_type,
-                limit=limit,
-            )
+            config = self._search_query(district, listing_type, limit)
 
-            scraper = PropertyScraper(config=config)
+            scraper = PropertyScraper(
+                config=config,
+                transport=self.transport,
+                archive=self.archive,
+                pipeline=self.pipeline,
+                listing_index=listing_index,
+            )
             pages_needed: int = int((max_properties / limit.value) + 1)
-            scraper.scrape_multiple_pages(pages_needed)
+            scraper.scrape_multiple_pages(
+                pages_needed,
+                on_page=self._stream_page(district, listing_type, max_properties),
+                max_properties=max_properties,
+            )
 
             properties: List[Property] = scraper.get_properties()[:max_properties]
+            if self.sink is not None:
+                self.sink.flush()
 
             self._save_properties(properties, district, listing_type)
 
@@ -58,28 +117,66 @@ class BatchScraper:
             logger.error(f"Failed {district.name} - {listing_type.name}: {e}")
             return 0
 
+    def _stream_page(
+        self, district: District, listing_type: ListingType, max_properties: int
+    ) -> Optional[PageCallback]:
+        """Page callback passing properties to the sink, capped at max_properties"""
+        if self.sink is None:
+            return None
+
+        streamed = 0
+
+        def on_page(page_properties: List[Property]) -> None:
+            nonlocal streamed
+            page_properties = page_properties[: max_properties - streamed]
+            streamed += len(page_properties)
+            self.sink.add(page_properties, district, listing_type)
+
+        return on_page
+
     def _save_properties(
         self,
         properties: List[Property],
         district: District,
         listing_type: ListingType,
     ) -> None:
-        """Save properties to CSV file"""
+        """Save properties to raw CSV file and queue them for history, whichever are enabled"""
 
-        output_dir = self.get_output_directory(listing_type)
-        os.makedirs(output_dir, exist_ok=True)
-
-        filename = f"{district.name.lower()}_{listing_type.name.lower()}{'s'}.csv"
-        filepath = os.path.join(output_dir, filename)
-
-        if properties:
-            df = pd.DataFrame([prop.__dict__ for prop in properties])
-            df.to_csv(filepath, index=False, encoding="utf-8-sig")
-            logger.info(f"Saved {len(properties)} properties to {filepath}")
-        else:
+        if not properties:
             logger.warning(
                 f"No properties found for {district.name} - {listing_type.name}"
             )
+            self._history_gaps.setdefault(listing_type, []).append(district)
+            return
+
+        if self.base_output_dir is not None:
+            df = write_raw_csv(properties, self.base_output_dir, district, listing_type)
+        else:
+            df = PropertyBatch(properties).to_dataframe()
+
+        if self.history_dir is not None:
+            self._history_frames.setdefault(listing_type, []).append(
+                df.assign(district=district.name)
+            )
+
+    def _record_history(self) -> None:
+        """Record one snapshot per listing type over all districts of the batch"""
+        frames, gaps = self._history_frames, self._history_gaps
+        self._history_frames, self._history_gaps = {}, {}
+        if self.history_dir is None:
+            return
+
+        for listing_type, type_frames in frames.items():
+            missing = gaps.get(listing_type, [])
+            if missing:
+                # A partial snapshot would show every listing of these districts as removed
+                logger.warning(
+                    f"Not recording {listing_type.name} history, no properties for "
+                    + ", ".join(district.name for district in missing)
+                )
+                continue
+            history_path = self.get_output_directory(listing_type, self.history_dir)
+            SnapshotStore(history_path).record(pd.concat(type_frames, ignore_index=True))
 
     def scrape_multiple_combinations(
         self,
@@ -93,6 +190,7 @@ class BatchScraper:
         import time
 
         total_scraped = 0
+        listing_index = ListingIndex()
 
         for district in districts:
             for listing_type in listing_types:
@@ -101,6 +199,7 @@ class BatchScraper:
                     listing_type=listing_type,
                     limit=limit,
                     max_properties=max_properties,
+                    listing_index=listing_index,
                 )
                 total_scraped += count
 
@@ -112,4 +211,76 @@ class BatchScraper:
                     )
                     time.sleep(delay_seconds)
 
+        self._record_history()
+        logger.info(f"Unique listings seen: {len(listing_index)}")
+        logger.info(f"Transport metrics: {self.transport.get_metrics()}")
+
+        return total_scraped
+
+    def scrape_scheduled(
+        self,
+        districts: List[District],
+        listing_types: List[ListingType],
+        limit: ResultLimit,
+        max_properties: int,
+        crawl_workers: int = DEFAULT_CRAWL_WORKERS,
+    ) -> int:
+        """Scrape all combinations at once through one global detail-page scheduler"""
+
+        listing_index = ListingIndex()
+        scheduler = DetailScheduler(
+            transport=self.transport,
+            pipeline=self.pipeline,
+            fetch_workers=self.max_workers,
+            crawl_workers=crawl_workers,
+            archive=self.archive,
+            listing_index=listing_index,
+        )
+
+        pages_needed: int = int((max_properties / limit.value) + 1)
+        combinations = [
+            (
+                district,
+                listing_type,
+                self._search_query(district, listing_type, limit),
+                max_properties,
+                pages_needed,
+            )
+            for district in districts
+            for listing_type in listing_types
+        ]
+
+        def on_property(job: CrawlJob, prop: Property) -> None:
+            self.sink.add([prop], job.district, job.listing_type)
+
+        def on_complete(job: CrawlJob, properties: List[Property]) -> None:
+            if self.sink is not None:
+                self.sink.flush()
+            self._save_properties(properties, job.district, job.listing_type)
+
+        jobs = scheduler.run(
+            combinations,
+            on_property=on_property if self.sink is not None else None,
+            on_complete=on_complete,
+        )
+        total_scraped = sum(len(job.results) for job in jobs)
+
+        self._record_history()
+        logger.info(f"Unique listings seen: {len(listing_index)}")
+        logger.info(f"Transport metrics: {self.transport.get_metrics()}")
+
         return total_scraped
+
+    def close(self) -> None:
+        """Shut down the parser processes and connections this scraper created"""
+        if self._owns_pipeline and self._pipeline is not None:
+            self._pipeline.close()
+            self._pipeline = None
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "BatchScraper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
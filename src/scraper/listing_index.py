@@ -0,0 +1,52 @@
+import logging
+import threading
+from typing import List, Optional, Set
+from ..models.property import Property
+
+logger = logging.getLogger(__name__)
+
+
+class ListingIndex:
+    """Thread-safe hash index of listing IDs already queued during one run"""
+
+    def __init__(self):
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, link: str) -> bool:
+        """Mark listing as seen, returns False if it was already claimed"""
+        listing_id = Property.listing_id_from_link(link)
+        with self._lock:
+            if listing_id in self._seen:
+                return False
+            self._seen.add(listing_id)
+            return True
+
+    def filter_new(self, links: List[str], limit: Optional[int] = None) -> List[str]:
+        """Keep only links whose listing has not been claimed yet
+
+        With a limit, claiming stops once `limit` new links are found, so links
+        past the cap stay available to other combinations.
+        """
+        new_links: List[str] = []
+        examined = 0
+        for link in links:
+            if limit is not None and len(new_links) >= limit:
+                break
+            examined += 1
+            if self.claim(link):
+                new_links.append(link)
+
+        skipped = examined - len(new_links)
+        if skipped:
+            logger.info(f"Skipped {skipped} already seen listings")
+
+        return new_links
+
+    def __contains__(self, link: str) -> bool:
+        with self._lock:
+            return Property.listing_id_from_link(link) in self._seen
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._seen)
@@ -0,0 +1,213 @@
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.property import Property
+from .property_parser import parse_property_page
+
+try:
+    import resource
+except ImportError:  # not on Windows, parser memory is then not reported
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Fetch function returns raw page bytes, or None when the page could not be fetched
+FetchFunction = Callable[[str], Optional[bytes]]
+
+# Parser processes must not be forked from a process running fetch and pool threads,
+# a fork copies their held locks. forkserver forks from a clean single-threaded server
+START_METHOD: str = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _parse_in_worker(url: str, content: bytes) -> Tuple[Property, int]:
+    """Worker-process job: parse one page, also report the worker's peak RSS in KiB
+
+    Parser processes are children of the forkserver, not of this process, so
+    RUSAGE_CHILDREN never covers them; each worker reports its own peak instead.
+    """
+    prop = parse_property_page(url, content)
+    # ru_maxrss is in KiB on Linux
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    return prop, peak_kib
+
+
+class FetchParsePipeline:
+    """Downloads pages on I/O threads and parses them in a separate process pool
+
+    Both stages are connected by a bounded queue and a bounded number of
+    in-flight parse jobs, so a slow stage applies back-pressure to the other
+    one instead of buffering whole pages in memory.
+    """
+
+    def __init__(
+        self,
+        fetch_workers: int = 5,
+        parse_workers: Optional[int] = None,
+        queue_size: int = 64,
+    ):
+        if fetch_workers < 1:
+            raise ValueError("fetch_workers must be 1 or greater")
+        if queue_size < 1:
+            raise ValueError("queue_size must be 1 or greater")
+
+        self.fetch_workers = fetch_workers
+        # None = one parser process per core, 0 = parse on the I/O threads
+        self.parse_workers = (
+            os.cpu_count() or 1 if parse_workers is None else parse_workers
+        )
+        self.queue_size = queue_size
+        self._executor: Optional[ProcessPoolExecutor] = (
+            ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context(START_METHOD),
+            )
+            if self.parse_workers > 0
+            else None
+        )
+        # Caps parse jobs submitted one by one through submit_parse
+        self._parse_slots = threading.BoundedSemaphore(queue_size)
+        self._peak_lock = threading.Lock()
+        self._parser_peak_rss_kib = 0
+
+    @property
+    def parser_peak_rss_kib(self) -> int:
+        """Largest peak RSS reported by any parser process, 0 without a process pool"""
+        with self._peak_lock:
+            return self._parser_peak_rss_kib
+
+    def _submit_to_pool(self, url: str, content: bytes) -> Future:
+        """Submit a parse job, the returned Future resolves to the Property only"""
+        parsed: Future = Future()
+
+        def unwrap(done: Future) -> None:
+            try:
+                prop, peak_kib = done.result()
+            except BaseException as e:
+                parsed.set_exception(e)
+                return
+            with self._peak_lock:
+                self._parser_peak_rss_kib = max(self._parser_peak_rss_kib, peak_kib)
+            parsed.set_result(prop)
+
+        self._executor.submit(_parse_in_worker, url, content).add_done_callback(unwrap)
+        return parsed
+
+    def _fetch_and_parse(self, fetch: FetchFunction, url: str) -> Optional[Property]:
+        """Single-stage fallback: fetch and parse on the same I/O thread"""
+        content = fetch(url)
+        if content is None:
+            return None
+        return self._parse_safely(url, content)
+
+    @staticmethod
+    def _parse_safely(url: str, content: bytes) -> Optional[Property]:
+        try:
+            return parse_property_page(url, content)
+        except Exception as e:
+            logger.error(f"Failed to parse {url}: {e}")
+            return None
+
+    def submit_parse(self, url: str, content: bytes) -> Future:
+        """Parse one fetched page, blocking while queue_size parse jobs are in flight
+
+        Without a process pool the page is parsed on the calling thread and
+        an already completed Future is returned.
+        """
+        if self._executor is None:
+            future: Future = Future()
+            future.set_result(self._parse_safely(url, content))
+            return future
+
+        self._parse_slots.acquire()
+        try:
+            future = self._submit_to_pool(url, content)
+        except Exception:
+            self._parse_slots.release()
+            raise
+        future.add_done_callback(lambda _: self._parse_slots.release())
+        return future
+
+    def run(self, urls: List[str], fetch: FetchFunction) -> List[Optional[Property]]:
+        """Fetch and parse all URLs, returning results in input order"""
+        if not urls:
+            return []
+
+        if self._executor is None:
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as io_executor:
+                return list(
+                    io_executor.map(lambda url: self._fetch_and_parse(fetch, url), urls)
+                )
+
+        downloaded: "queue.Queue[Tuple[int, str, Optional[bytes]]]" = queue.Queue(
+            maxsize=self.queue_size
+        )
+        in_flight = threading.BoundedSemaphore(self.queue_size)
+        cancelled = threading.Event()
+
+        def fetch_into_queue(position: int, url: str) -> None:
+            if cancelled.is_set():
+                return
+            content: Optional[bytes] = None
+            try:
+                content = fetch(url)
+            finally:
+                # Blocks while the parse stage is saturated, gives up once run() failed
+                while not cancelled.is_set():
+                    try:
+                        downloaded.put((position, url, content), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+        parse_futures: Dict[int, Future] = {}
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as io_executor:
+            for position, url in enumerate(urls):
+                io_executor.submit(fetch_into_queue, position, url)
+
+            try:
+                for _ in range(len(urls)):
+                    position, url, content = downloaded.get()
+                    if content is None:
+                        continue
+
+                    in_flight.acquire()
+                    try:
+                        future = self._submit_to_pool(url, content)
+                    except Exception:
+                        in_flight.release()
+                        raise
+                    future.add_done_callback(lambda _: in_flight.release())
+                    parse_futures[position] = future
+
+            except BaseException:
+                # E.g. a broken process pool: unblock and drop the remaining fetches
+                cancelled.set()
+                io_executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        results: List[Optional[Property]] = [None] * len(urls)
+        for position, future in parse_futures.items():
+            try:
+                results[position] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to parse {urls[position]}: {e}")
+
+        return results
+
+    def close(self) -> None:
+        """Shut down the parser process pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "FetchParsePipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
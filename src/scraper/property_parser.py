@@ -0,0 +1,185 @@
+import logging
+import urllib.parse
+from typing import Any, Dict, List, Optional
+from bs4 import BeautifulSoup, Tag
+from ..models.property import Property
+from .config import ALL_DETAILS
+
+logger = logging.getLogger(__name__)
+
+
+class PropertyParser:
+    """Turns listing detail page HTML into Property objects"""
+
+    def _get_price(self, soup: BeautifulSoup) -> Optional[int]:
+        """Extract price from listing detail page"""
+        try:
+            price_tag = soup.find(
+                "strong",
+                {
+                    "data-cy": "adPageHeaderPrice",
+                    "data-sentry-element": "Price",
+                    "data-sentry-source-file": "AdPrice.tsx",
+                },
+            )
+
+            if price_tag:
+                price_text = price_tag.text.strip()
+                price_numbers = "".join(filter(str.isdigit, price_text))
+                return int(price_numbers) if price_numbers else None
+
+            return None
+        except Exception as e:
+            logger.warning(f"Could not extract price: {e}")
+            return None
+
+    def _get_location(self, soup: BeautifulSoup) -> Optional[str]:
+        """Extract location from listing detail page"""
+        try:
+            location_tag = soup.find(
+                "a",
+                {
+                    "data-sentry-element": "StyledLink",
+                    "data-sentry-source-file": "MapLink.tsx",
+                },
+            )
+            if location_tag:
+                return location_tag.text
+            return None
+        except Exception as e:
+            logger.warning(f"Could not extract location: {e}")
+            return None
+
+    def _find_item_containers(self, soup: BeautifulSoup) -> List:
+        """Find all ItemGridContainer elements"""
+        return soup.find_all(
+            "div",
+            {
+                "data-sentry-element": "ItemGridContainer",
+                "data-sentry-source-file": "AdDetailItem.tsx",
+            },
+        )
+
+    def _find_label_container(self, container, label_text: str) -> Optional[Any]:
+        """Find container with matching label text"""
+        label_div = container.find(
+            "div",
+            {
+                "data-sentry-element": "Item",
+                "data-sentry-source-file": "AdDetailItem.tsx",
+            },
+        )
+
+        if label_div and label_text in label_div.get_text():
+            return label_div
+        return None
+
+    def _find_field_value_by_label(
+        self, soup: BeautifulSoup, label_text: str
+    ) -> Optional[str]:
+        """Universal function to find field value by label in ItemGridContainer"""
+        try:
+            containers: List[Tag] = self._find_item_containers(soup)
+            for container in containers:
+                label_div: Optional[Tag] = self._find_label_container(container, label_text)
+                if label_div:
+                    value_div: Optional[Tag] = label_div.find_next_sibling("div")
+                    if value_div:
+                        return value_div.get_text(strip=True)
+            return None
+        except Exception as e:
+            logger.warning(f"Could not extract field '{label_text}': {e}")
+            return None
+
+    def _get_additional_features(self, soup: BeautifulSoup) -> Optional[str]:
+        """Extract additional features as pipe-separated string"""
+        try:
+            containers = self._find_item_containers(soup)
+
+            for container in containers:
+                label_div = self._find_label_container(
+                    container, "Informacje dodatkowe:"
+                )
+
+                if label_div:
+                    features_div = label_div.find_next_sibling("div")
+                    if features_div:
+                        spans = features_div.find_all("span", class_="css-axw7ok")
+                        features = [
+                            span.get_text(strip=True)
+                            for span in spans
+                            if span.get_text(strip=True)
+                        ]
+
+                        if features:
+                            return " | ".join(features)
+
+            return None
+        except Exception as e:
+            logger.warning(f"Could not extract additional features: {e}")
+            return None
+
+    def _extract_all_details(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        property_data: Dict[str, Any] = {}
+
+        # Extract price and location with custom methods
+        property_data["price"] = self._get_price(soup)
+        property_data["location"] = self._get_location(soup)
+
+        # Extract all mapped fields
+        for field_name, polish_label in ALL_DETAILS.items():
+            property_data[field_name] = self._find_field_value_by_label(
+                soup, polish_label
+            )
+
+        # Extract additional features
+        property_data["additional_features"] = self._get_additional_features(soup)
+
+        return property_data
+
+    def parse(self, detail_link: str, content: bytes) -> Property:
+        """Build Property from raw detail page bytes"""
+        soup = BeautifulSoup(content, "html.parser", from_encoding="utf-8")
+
+        property_data: Dict[str, Any] = self._extract_all_details(soup)
+
+        return Property(
+            link=detail_link,
+            price=property_data.get("price"),
+            location=property_data.get("location"),
+            area=property_data.get("area"),
+            rooms=property_data.get("rooms"),
+            heating=property_data.get("heating"),
+            floor=property_data.get("floor"),
+            maintenance_fee=property_data.get("maintenance_fee"),
+            condition=property_data.get("condition"),
+            market=property_data.get("market"),
+            ownership=property_data.get("ownership"),
+            advertiser_type=property_data.get("advertiser_type"),
+            year_built=property_data.get("year_built"),
+            elevator=property_data.get("elevator"),
+            building_type=property_data.get("building_type"),
+            windows=property_data.get("windows"),
+            security=property_data.get("security"),
+            additional_features=property_data.get("additional_features"),
+        )
+
+
+_PARSER = PropertyParser()
+
+
+def parse_property_page(detail_link: str, content: bytes) -> Property:
+    """Module-level entry point so parsing can run in worker processes"""
+    return _PARSER.parse(detail_link, content)
+
+
+def parse_listing_links(page_url: str, content: bytes) -> List[str]:
+    """Absolute detail links of all listing cards on a search results page"""
+    soup = BeautifulSoup(content, "html.parser", from_encoding="utf-8")
+    card_elements = soup.find_all("a", {"data-cy": "listing-item-link"})
+    # Relative card links resolve against the search host, e.g. a local stand-in
+    return [
+        urllib.parse.urljoin(page_url, card["href"])
+        for card in card_elements
+        if card.get("href")
+    ]
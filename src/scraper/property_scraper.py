@@ -1,24 +1,38 @@
-from concurrent.futures import ThreadPoolExecutor
 import requests
-import urllib
 import logging
-from typing import Any, Dict, List, Optional
-from bs4 import BeautifulSoup, Tag
+from typing import Callable, Dict, List, Optional
 from ..models.property import Property
-from .config import ALL_DETAILS, HEADERS
+from .archive import DETAIL_PAGE, LIST_PAGE, PageArchive
+from .listing_index import ListingIndex
+from .pipeline import FetchParsePipeline
+from .property_parser import parse_listing_links
 from .search_params import PropertySearchQuery
+from .transport import HttpTransport
 
 logger = logging.getLogger(__name__)
 
-BASE_URL: str = "https://www.otodom.pl"
+PageCallback = Callable[[List[Property]], None]
 
 
 class PropertyScraper:
-    def __init__(self, config: PropertySearchQuery):
+    def __init__(
+        self,
+        config: PropertySearchQuery,
+        transport: Optional[HttpTransport] = None,
+        max_workers: int = 5,
+        archive: Optional[PageArchive] = None,
+        pipeline: Optional[FetchParsePipeline] = None,
+        listing_index: Optional[ListingIndex] = None,
+    ):
         self.config: PropertySearchQuery = config
         self.properties: List[Property] = []
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.transport: HttpTransport = transport or HttpTransport()
+        self.archive: Optional[PageArchive] = archive
+        self.pipeline: FetchParsePipeline = pipeline or FetchParsePipeline(
+            fetch_workers=max_workers, parse_workers=0
+        )
+        # Shared across scrapers to skip listings promoted on several pages/districts
+        self.listing_index: ListingIndex = listing_index or ListingIndex()
 
     def get_properties(self) -> List[Property]:
         """Get list of scraped properties"""
@@ -28,19 +42,34 @@ class PropertyScraper:
         """Get number of scraped properties"""
         return len(self.properties)
 
-    def _extract_links(self, card_elements) -> List[str]:
-        """Helper function for extracting href from given <a> element"""
-        card_links: List[str] = []
-        for listing_card in card_elements:
-            href = listing_card.get("href")
-            if href:
-                full_url = urllib.parse.urljoin(BASE_URL, href)
-                card_links.append(full_url)
-        logger.info(f"Extracted {len(card_links)} valid links")
-        return card_links
+    def _archive_tags(self) -> Dict[str, str]:
+        """Search context stored alongside archived pages for offline re-parse"""
+        tags = {"listing_type": self.config.listing_type.name}
+        if len(self.config.locations) == 1:
+            tags["district"] = self.config.locations[0].name
+        return tags
+
+    def _archive_response(self, url: str, response, kind: str = DETAIL_PAGE) -> None:
+        """Write fetched page to the archive, if archiving is enabled"""
+        if self.archive is None:
+            return
+
+        try:
+            self.archive.write(
+                url,
+                response.content,
+                status=response.status_code,
+                kind=kind,
+                tags=self._archive_tags(),
+            )
+        except Exception as e:
+            logger.warning(f"Could not archive {url}: {e}")
+
+    def fetch_listing_links(self, page: int = 1, limit: Optional[int] = None) -> List[str]:
+        """Retrieves new property listing URLs from the specified page
 
-    def _get_listing_card_links(self, page: int = 1) -> List[str]:
-        """Retrieves all property listing URLs from the specified page"""
+        Links are claimed in the listing index, at most `limit` of them.
+        """
 
         if page < 1:
             raise ValueError("Page must be 1 or greater")
@@ -48,204 +77,62 @@ class PropertyScraper:
         try:
             logger.info(f"Fetching page {page}")
             url: str = self.config.get_url(page=page)
-            response = self.session.get(url)
-            response.encoding = "utf-8"
-            soup = BeautifulSoup(response.content, "html.parser")
-            listing_card_elements = soup.find_all("a", {"data-cy": "listing-item-link"})
-            logger.info(f"Found {len(listing_card_elements)} listings")
-            return self._extract_links(listing_card_elements)
+            response = self.transport.get(url)
+            self._archive_response(url, response, kind=LIST_PAGE)
+            card_links = parse_listing_links(url, response.content)
+            logger.info(f"Found {len(card_links)} listings")
+            return self.listing_index.filter_new(card_links, limit=limit)
         except requests.RequestException as e:
             logger.error(f"Error fetching page {page}: {e}")
             return []
 
-    def _get_price(self, soup: BeautifulSoup) -> Optional[int]:
-        """Extract price from listing detail page"""
-        try:
-            price_tag = soup.find(
-                "strong",
-                {
-                    "data-cy": "adPageHeaderPrice",
-                    "data-sentry-element": "Price",
-                    "data-sentry-source-file": "AdPrice.tsx",
-                },
-            )
-
-            if price_tag:
-                price_text = price_tag.text.strip()
-                price_numbers = "".join(filter(str.isdigit, price_text))
-                return int(price_numbers) if price_numbers else None
-
-            return None
-        except Exception as e:
-            logger.warning(f"Could not extract price: {e}")
-            return None
-
-    def _get_location(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract location from listing detail page"""
-        try:
-            location_tag = soup.find(
-                "a",
-                {
-                    "data-sentry-element": "StyledLink",
-                    "data-sentry-source-file": "MapLink.tsx",
-                },
-            )
-            if location_tag:
-                return location_tag.text
-            return None
-        except Exception as e:
-            logger.warning(f"Could not extract location: {e}")
-            return None
-
-    def _find_item_containers(self, soup: BeautifulSoup) -> List:
-        """Find all ItemGridContainer elements"""
-        return soup.find_all(
-            "div",
-            {
-                "data-sentry-element": "ItemGridContainer",
-                "data-sentry-source-file": "AdDetailItem.tsx",
-            },
-        )
-
-    def _find_label_container(self, container, label_text: str) -> Optional[Any]:
-        """Find container with matching label text"""
-        label_div = container.find(
-            "div",
-            {
-                "data-sentry-element": "Item",
-                "data-sentry-source-file": "AdDetailItem.tsx",
-            },
-        )
-
-        if label_div and label_text in label_div.get_text():
-            return label_div
-        return None
-
-    def _find_field_value_by_label(
-        self, soup: BeautifulSoup, label_text: str
-    ) -> Optional[str]:
-        """Universal function to find field value by label in ItemGridContainer"""
-        try:
-            containers: List[Tag] = self._find_item_containers(soup)
-            for container in containers:
-                label_div: Optional[Tag] = self._find_label_container(container, label_text)
-                if label_div:
-                    value_div: Optional[Tag] = label_div.find_next_sibling("div")
-                    if value_div:
-                        return value_div.get_text(strip=True)
-            return None
-        except Exception as e:
-            logger.warning(f"Could not extract field '{label_text}': {e}")
-            return None
-
-    def _get_additional_features(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract additional features as pipe-separated string"""
-        try:
-            containers = self._find_item_containers(soup)
-
-            for container in containers:
-                label_div = self._find_label_container(
-                    container, "Informacje dodatkowe:"
-                )
-
-                if label_div:
-                    features_div = label_div.find_next_sibling("div")
-                    if features_div:
-                        spans = features_div.find_all("span", class_="css-axw7ok")
-                        features = [
-                            span.get_text(strip=True)
-                            for span in spans
-                            if span.get_text(strip=True)
-                        ]
-
-                        if features:
-                            return " | ".join(features)
-
-            return None
-        except Exception as e:
-            logger.warning(f"Could not extract additional features: {e}")
-            return None
-
-    def _extract_all_details(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        property_data: Dict[str, Any] = {}
-
-        # Extract price and location with custom methods
-        property_data["price"] = self._get_price(soup)
-        property_data["location"] = self._get_location(soup)
-
-        # Extract all mapped fields
-        for field_name, polish_label in ALL_DETAILS.items():
-            property_data[field_name] = self._find_field_value_by_label(
-                soup, polish_label
-            )
-
-        # Extract additional features
-        property_data["additional_features"] = self._get_additional_features(soup)
-
-        return property_data
-
-    def _scrape_single_property(self, detail_link: str) -> Optional[Property]:
+    def fetch_detail(self, detail_link: str) -> Optional[bytes]:
+        """Download detail page bytes, parsing happens in the pipeline"""
         try:
             logger.info(f"Scraping: {detail_link}")
 
-            response = self.session.get(detail_link)
+            response = self.transport.get(detail_link)
             response.raise_for_status()
-            response.encoding = "utf-8"
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            property_data: Dict[str, Any] = self._extract_all_details(soup)
-
-            property_obj = Property(
-                link=detail_link,
-                price=property_data.get("price"),
-                location=property_data.get("location"),
-                area=property_data.get("area"),
-                rooms=property_data.get("rooms"),
-                heating=property_data.get("heating"),
-                floor=property_data.get("floor"),
-                maintenance_fee=property_data.get("maintenance_fee"),
-                condition=property_data.get("condition"),
-                market=property_data.get("market"),
-                ownership=property_data.get("ownership"),
-                advertiser_type=property_data.get("advertiser_type"),
-                year_built=property_data.get("year_built"),
-                elevator=property_data.get("elevator"),
-                building_type=property_data.get("building_type"),
-                windows=property_data.get("windows"),
-                security=property_data.get("security"),
-                additional_features=property_data.get("additional_features"),
-            )
+            self._archive_response(detail_link, response)
 
-            logger.info(f"Scraped: {property_obj}")
-            return property_obj
+            return response.content
 
         except Exception as e:
             logger.error(f"Failed to scrape {detail_link}: {e}")
             return None
 
-    def scrape_single_page_details(self, page: int = 1) -> List[Property]:
-        """Scrape one page and return properties - THREADED VERSION"""
+    def scrape_single_page_details(
+        self, page: int = 1, limit: Optional[int] = None
+    ) -> List[Property]:
+        """Scrape one page and return properties - PIPELINED VERSION"""
 
-        listing_card_links: List[str] = self._get_listing_card_links(page=page)
+        listing_card_links: List[str] = self.fetch_listing_links(page=page, limit=limit)
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            results = list(
-                executor.map(self._scrape_single_property, listing_card_links)
-            )
+        results = self.pipeline.run(listing_card_links, self.fetch_detail)
 
         page_properties = [prop for prop in results if prop is not None]
 
         return page_properties
 
-    def scrape_multiple_pages(self, max_pages: int) -> None:
-        """Scrape multiple pages"""
+    def scrape_multiple_pages(
+        self,
+        max_pages: int,
+        on_page: Optional[PageCallback] = None,
+        max_properties: Optional[int] = None,
+    ) -> None:
+        """Scrape multiple pages, handing each page's properties to on_page as it completes"""
         logger.info(f"Starting scrape for {max_pages} pages")
 
         for page in range(1, max_pages + 1):
+            room = None if max_properties is None else max_properties - len(self.properties)
+            if room is not None and room <= 0:
+                break
             logger.info(f"Processing page {page}/{max_pages}")
 
-            page_properties: List[Property] = self.scrape_single_page_details(page)
+            page_properties: List[Property] = self.scrape_single_page_details(page, limit=room)
             self.properties.extend(page_properties)
+            if on_page is not None:
+                on_page(page_properties)
 
             logger.info(f"Page {page} done: {len(page_properties)} properties")
 
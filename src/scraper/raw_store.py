@@ -0,0 +1,45 @@
+import logging
+import os
+from typing import List, Optional
+import pandas as pd
+from ..models.property import Property
+from ..models.property_batch import PropertyBatch
+from ..models.types import District, ListingType
+
+logger = logging.getLogger(__name__)
+
+
+def raw_output_directory(base_dir: str, listing_type: ListingType) -> str:
+    """Get output directory based on listing type"""
+    if listing_type == ListingType.SALE:
+        return os.path.join(base_dir, "sales")
+    elif listing_type == ListingType.RENT:
+        return os.path.join(base_dir, "rents")
+    else:
+        return os.path.join(base_dir, listing_type.name.lower())
+
+
+def raw_csv_path(base_dir: str, district: District, listing_type: ListingType) -> str:
+    """Raw CSV file of one district-listing type combination"""
+    filename = f"{district.name.lower()}_{listing_type.name.lower()}s.csv"
+    return os.path.join(raw_output_directory(base_dir, listing_type), filename)
+
+
+def write_raw_csv(
+    properties: List[Property],
+    base_dir: str,
+    district: District,
+    listing_type: ListingType,
+) -> Optional[pd.DataFrame]:
+    """Save properties to the raw CSV of their combination, returns the saved frame"""
+    if not properties:
+        logger.warning(f"No properties found for {district.name} - {listing_type.name}")
+        return None
+
+    filepath = raw_csv_path(base_dir, district, listing_type)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    df = PropertyBatch(properties).to_dataframe()
+    df.to_csv(filepath, index=False, encoding="utf-8-sig")
+    logger.info(f"Saved {len(properties)} properties to {filepath}")
+    return df
@@ -0,0 +1,263 @@
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from ..models.property import Property
+from ..models.types import District, ListingType
+from .archive import PageArchive
+from .listing_index import ListingIndex
+from .pipeline import FetchParsePipeline
+from .property_scraper import PropertyScraper
+from .search_params import PropertySearchQuery
+from .transport import HttpTransport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CRAWL_WORKERS: int = 2
+# A combination with this many listings or fewer left jumps the round-robin order
+DEFAULT_FINISH_THRESHOLD: int = 8
+
+
+@dataclass
+class CrawlJob:
+    """One district-listing type combination and its scheduling state"""
+
+    district: District
+    listing_type: ListingType
+    config: PropertySearchQuery
+    max_properties: int
+    max_pages: int
+
+    pending: Deque[str] = field(default_factory=deque)
+    links: List[str] = field(default_factory=list)
+    results: Dict[str, Property] = field(default_factory=dict)
+    queued: int = 0
+    received: int = 0
+    crawl_done: bool = False
+    finished: bool = False
+    scraper: Optional[PropertyScraper] = None
+
+    @property
+    def remaining(self) -> int:
+        """Listings queued but not fetched and parsed yet"""
+        return self.queued - self.received
+
+    def properties(self) -> List[Property]:
+        """Parsed properties in list-page order"""
+        return [self.results[link] for link in self.links if link in self.results]
+
+
+PropertyCallback = Callable[[CrawlJob, Property], None]
+CompleteCallback = Callable[[CrawlJob, List[Property]], None]
+
+
+class DetailScheduler:
+    """Global queue of detail-page fetches fed by list-page crawlers of all combinations
+
+    A few crawler threads walk the list pages of every combination and push
+    new links into per-combination deques. One pool of fetch workers pulls
+    from all deques: combinations whose crawl is done and that have at most
+    `finish_threshold` listings left go first, the rest are served round
+    robin. Workers never wait on a single combination while any other one
+    has work, so small districts no longer leave the pool idle.
+
+    Fetched pages are parsed through the shared FetchParsePipeline. Results
+    are collected on the thread calling run(), which also runs callbacks.
+    """
+
+    def __init__(
+        self,
+        transport: HttpTransport,
+        pipeline: FetchParsePipeline,
+        fetch_workers: int = 5,
+        crawl_workers: int = DEFAULT_CRAWL_WORKERS,
+        archive: Optional[PageArchive] = None,
+        listing_index: Optional[ListingIndex] = None,
+        finish_threshold: int = DEFAULT_FINISH_THRESHOLD,
+    ):
+        if fetch_workers < 1:
+            raise ValueError("fetch_workers must be 1 or greater")
+        if crawl_workers < 1:
+            raise ValueError("crawl_workers must be 1 or greater")
+
+        self.transport = transport
+        self.pipeline = pipeline
+        self.fetch_workers = fetch_workers
+        self.crawl_workers = crawl_workers
+        self.archive = archive
+        self.listing_index = listing_index or ListingIndex()
+        self.finish_threshold = finish_threshold
+
+        self._jobs: List[CrawlJob] = []
+        self._cursor = 0
+        self._crawls_left = 0
+        self._condition = threading.Condition()
+        self._results: "queue.Queue[Tuple[CrawlJob, Optional[str], Optional[Future]]]" = (
+            queue.Queue()
+        )
+
+    def _crawl(self, job: CrawlJob) -> None:
+        """Walk list pages of one combination, queueing its new detail links"""
+        try:
+            for page in range(1, job.max_pages + 1):
+                with self._condition:
+                    room = job.max_properties - job.queued
+                if room <= 0:
+                    break
+
+                # Only links within the cap are claimed, the rest stay free for other jobs
+                links = job.scraper.fetch_listing_links(page=page, limit=room)
+                with self._condition:
+                    job.pending.extend(links)
+                    job.links.extend(links)
+                    job.queued += len(links)
+                    self._condition.notify_all()
+
+        except Exception as e:
+            logger.error(f"Crawl failed {job.district.name} - {job.listing_type.name}: {e}")
+
+        finally:
+            with self._condition:
+                job.crawl_done = True
+                self._crawls_left -= 1
+                self._condition.notify_all()
+            # Wakes the collector, a job with no links completes here
+            self._results.put((job, None, None))
+
+    def _pick_job(self) -> Optional[CrawlJob]:
+        """Nearly finished combinations first, then round robin over the rest"""
+        ready = [job for job in self._jobs if job.pending]
+        if not ready:
+            return None
+
+        finishing = [
+            job for job in ready
+            if job.crawl_done and job.remaining <= self.finish_threshold
+        ]
+        if finishing:
+            return min(finishing, key=lambda job: job.remaining)
+
+        for offset in range(len(self._jobs)):
+            position = (self._cursor + offset) % len(self._jobs)
+            job = self._jobs[position]
+            if job.pending:
+                self._cursor = position + 1
+                return job
+        return None
+
+    def _next_task(self) -> Optional[Tuple[CrawlJob, str]]:
+        """Block until a detail link is available, None once all work is handed out"""
+        with self._condition:
+            while True:
+                job = self._pick_job()
+                if job is not None:
+                    return job, job.pending.popleft()
+                if self._crawls_left == 0:
+                    return None
+                self._condition.wait()
+
+    def _fetch_worker(self) -> None:
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+
+            job, link = task
+            content = job.scraper.fetch_detail(link)
+            if content is None:
+                self._results.put((job, link, None))
+                continue
+
+            try:
+                future = self.pipeline.submit_parse(link, content)
+            except Exception as e:
+                logger.error(f"Failed to parse {link}: {e}")
+                self._results.put((job, link, None))
+                continue
+            future.add_done_callback(
+                lambda done, job=job, link=link: self._results.put((job, link, done))
+            )
+
+    def run(
+        self,
+        combinations: List[Tuple[District, ListingType, PropertySearchQuery, int, int]],
+        on_property: Optional[PropertyCallback] = None,
+        on_complete: Optional[CompleteCallback] = None,
+    ) -> List[CrawlJob]:
+        """Scrape all (district, listing type, query, max properties, max pages) combinations"""
+        self._jobs = [
+            CrawlJob(district, listing_type, config, max_properties, max_pages)
+            for district, listing_type, config, max_properties, max_pages in combinations
+        ]
+        for job in self._jobs:
+            job.scraper = PropertyScraper(
+                config=job.config,
+                transport=self.transport,
+                archive=self.archive,
+                pipeline=self.pipeline,
+                listing_index=self.listing_index,
+            )
+        self._cursor = 0
+        self._crawls_left = len(self._jobs)
+
+        unfinished = len(self._jobs)
+        with ThreadPoolExecutor(
+            max_workers=self.crawl_workers, thread_name_prefix="crawl"
+        ) as crawlers, ThreadPoolExecutor(
+            max_workers=self.fetch_workers, thread_name_prefix="fetch"
+        ) as fetchers:
+            for job in self._jobs:
+                crawlers.submit(self._crawl, job)
+            for _ in range(self.fetch_workers):
+                fetchers.submit(self._fetch_worker)
+
+            while unfinished:
+                job, link, future = self._results.get()
+
+                if link is not None:
+                    prop = self._result_of(link, future)
+                    with self._condition:
+                        job.received += 1
+                    if prop is not None:
+                        job.results[link] = prop
+                        if on_property is not None:
+                            self._call_safely(on_property, job, prop)
+
+                with self._condition:
+                    complete = not job.finished and job.crawl_done and job.remaining == 0
+                    if complete:
+                        job.finished = True
+                if complete:
+                    unfinished -= 1
+                    properties = job.properties()
+                    logger.info(
+                        f"Finished {job.district.name} - {job.listing_type.name}: "
+                        f"{len(properties)} properties, {unfinished} combinations left"
+                    )
+                    if on_complete is not None:
+                        self._call_safely(on_complete, job, properties)
+
+        return self._jobs
+
+    @staticmethod
+    def _call_safely(callback: Callable, job: CrawlJob, *args) -> None:
+        """Callback errors must not stop the collector, other jobs still complete"""
+        try:
+            callback(job, *args)
+        except Exception as e:
+            logger.error(
+                f"Callback failed for {job.district.name} - {job.listing_type.name}: {e}"
+            )
+
+    @staticmethod
+    def _result_of(link: str, future: Optional[Future]) -> Optional[Property]:
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Failed to parse {link}: {e}")
+            return None
@@ -26,6 +26,8 @@ class PropertySearchQuery:
     price_min: Optional[int] = None
     price_max: Optional[int] = None
     direction: Optional[SortDirection] = None
+    # Search endpoint, overridden to point the scraper at a local stand-in
+    base_url: str = BASE_URL
 
     def __post_init__(self):
         """Validate configuration after initialization"""
@@ -49,9 +51,9 @@ class PropertySearchQuery:
         """Build the base URL based on number of locations"""
         if len(self.locations) == 1:
             district = self.locations[0].value
-            return f"{BASE_URL}/{self.listing_type.value}/{self.property_type.value}/{district}"
+            return f"{self.base_url}/{self.listing_type.value}/{self.property_type.value}/{district}"
         else:
-            return f"{BASE_URL}/{self.listing_type.value}/{self.property_type.value}/wiele-lokalizacji"
+            return f"{self.base_url}/{self.listing_type.value}/{self.property_type.value}/wiele-lokalizacji"
 
     def _build_location_params(self) -> Dict[str, str]:
         """Build location-specific parameters"""
@@ -0,0 +1,302 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from .config import HEADERS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE: int = 16
+DEFAULT_TIMEOUT_SECONDS: float = 30.0
+DEFAULT_RETRIES: int = 3
+DEFAULT_BACKOFF_SECONDS: float = 0.5
+# Throttling and transient server errors are retried, honouring Retry-After
+RETRY_STATUSES: Sequence[int] = (429, 500, 502, 503, 504)
+# httpcore trace event emitted when a request has to open a new connection
+HTTPX_CONNECT_EVENT: str = "connection.connect_tcp.started"
+# HTTP/2 multiplexes requests over open connections, there is no checkout to wait on
+HTTP2_UNMETERED: Sequence[str] = ("connections_waited",)
+
+
+@dataclass
+class TransportMetrics:
+    """Thread-safe counters describing connection pool usage"""
+
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    connections_waited: int = 0
+    retries: int = 0
+    _latencies: List[float] = field(default_factory=list, repr=False, compare=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def record_latency(self, seconds: float) -> None:
+        """Store duration of one get() call, retries included"""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 99)) -> Dict[str, float]:
+        """Nearest-rank latency percentiles in seconds, e.g. {"p50": 0.12, "p99": 0.8}"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return {}
+
+        result = {}
+        for percentile in percentiles:
+            rank = max(1, math.ceil(len(latencies) * percentile / 100))
+            result[f"p{percentile:g}"] = latencies[rank - 1]
+        return result
+
+    def snapshot(self) -> Dict[str, int]:
+        """Get a consistent copy of all counters"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+                "connections_waited": self.connections_waited,
+                "retries": self.retries,
+            }
+
+
+class _MeteredPoolMixin:
+    """Counts new, reused and awaited connections of a urllib3 pool"""
+
+    metrics: TransportMetrics
+
+    def _new_conn(self):
+        self.metrics.increment("connections_opened")
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        if self.block and self.pool is not None and self.pool.empty():
+            self.metrics.increment("connections_waited")
+
+        opened_before = self.num_connections
+        conn = super()._get_conn(timeout=timeout)
+        if self.num_connections == opened_before:
+            self.metrics.increment("connections_reused")
+        return conn
+
+
+class _MeteredHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report to TransportMetrics"""
+
+    def __init__(self, metrics: TransportMetrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"metrics": self.metrics}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "MeteredHTTPConnectionPool",
+                (_MeteredPoolMixin, HTTPConnectionPool),
+                attrs,
+            ),
+            "https": type(
+                "MeteredHTTPSConnectionPool",
+                (_MeteredPoolMixin, HTTPSConnectionPool),
+                attrs,
+            ),
+        }
+
+
+class HttpTransport:
+    """Shared, pooled HTTP client used by all PropertyScraper instances"""
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        http2: bool = False,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        retries: int = DEFAULT_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    ):
+        if pool_size < 1:
+            raise ValueError("Pool size must be 1 or greater")
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.metrics = TransportMetrics()
+        # One policy for both clients, httpx applies it in _httpx_get_with_retries
+        self.retry = Retry(
+            total=retries,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=["GET"],
+            backoff_factor=backoff_seconds,
+            respect_retry_after_header=True,
+            # Last error response is returned, callers check the status
+            raise_on_status=False,
+        )
+
+        headers = dict(HEADERS)
+        # Advertise every encoding urllib3 can decode here (br/zstd if installed)
+        headers["Accept-Encoding"] = ACCEPT_ENCODING.replace(",", ", ")
+
+        self.http2 = http2 and self._http2_available()
+        if self.http2:
+            import httpx
+
+            self._client = httpx.Client(
+                http2=True,
+                headers=headers,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                ),
+            )
+            self._session = None
+        else:
+            self._client = None
+            self._session = requests.Session()
+            self._session.headers.update(headers)
+            adapter = _MeteredHTTPAdapter(
+                self.metrics,
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                pool_block=True,
+                max_retries=self.retry,
+            )
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+        logger.info(
+            f"HTTP transport ready (pool_size={pool_size}, http2={self.http2}, "
+            f"accept-encoding={headers['Accept-Encoding']})"
+        )
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """Check whether the optional httpx[http2] dependency is installed"""
+        try:
+            import httpx  # noqa: F401
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but httpx[http2] is missing, using HTTP/1.1")
+            return False
+        return True
+
+    def get(self, url: str):
+        """Perform GET request, returning a requests- or httpx-style response"""
+        self.metrics.increment("requests")
+        start = time.perf_counter()
+
+        try:
+            if self._client is not None:
+                import httpx
+
+                try:
+                    return self._httpx_get_with_retries(url)
+                except httpx.HTTPError as e:
+                    raise requests.RequestException(str(e)) from e
+
+            response = self._session.get(url, timeout=self.timeout)
+            retries = getattr(response.raw, "retries", None)
+            if retries is not None and retries.history:
+                self.metrics.increment("retries", len(retries.history))
+            return response
+
+        finally:
+            self.metrics.record_latency(time.perf_counter() - start)
+
+    def _httpx_get(self, url: str):
+        """One httpx request, counted as opened or reused through httpcore's trace hook"""
+        connected = False
+
+        def trace(event_name: str, info: Dict) -> None:
+            nonlocal connected
+            if event_name == HTTPX_CONNECT_EVENT:
+                connected = True
+
+        response = self._client.get(url, extensions={"trace": trace})
+        self.metrics.increment("connections_opened" if connected else "connections_reused")
+        return response
+
+    def _httpx_get_with_retries(self, url: str):
+        """httpx has no status retries, apply the session's Retry policy by hand"""
+        import httpx
+
+        for attempt in range(1, self.retry.total + 2):
+            retries_left = attempt <= self.retry.total
+            try:
+                response = self._httpx_get(url)
+            except httpx.TransportError as e:
+                if not retries_left:
+                    raise
+                delay = self._backoff_seconds(attempt)
+                logger.debug(f"Retrying {url} in {delay:.1f}s after {e!r}")
+            else:
+                if response.status_code not in RETRY_STATUSES or not retries_left:
+                    return response
+                delay = self._retry_after_seconds(response)
+                if delay is None:
+                    delay = self._backoff_seconds(attempt)
+                response.close()
+                logger.debug(f"Retrying {url} in {delay:.1f}s after {response.status_code}")
+
+            self.metrics.increment("retries")
+            time.sleep(delay)
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        """Same schedule as urllib3: retry at once, then backoff_factor * 2^(n-1)"""
+        if attempt <= 1:
+            return 0.0
+        return min(self.retry.backoff_factor * 2 ** (attempt - 1), self.retry.backoff_max)
+
+    def _retry_after_seconds(self, response) -> Optional[float]:
+        """Delay requested by a Retry-After header, in seconds or as an HTTP date"""
+        if response.status_code not in Retry.RETRY_AFTER_STATUS_CODES:
+            return None
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return self.retry.parse_retry_after(value)
+        except InvalidHeader:
+            logger.warning(f"Ignoring invalid Retry-After header: {value!r}")
+            return None
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get connection pool metrics, without counters the protocol cannot report"""
+        metrics = self.metrics.snapshot()
+        if self.http2:
+            for counter in HTTP2_UNMETERED:
+                metrics.pop(counter)
+        return metrics
+
+    def get_latency_percentiles(self, percentiles: Sequence[float] = (50, 99)) -> Dict[str, float]:
+        """Get request latency percentiles in seconds"""
+        return self.metrics.latency_percentiles(percentiles)
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,42 @@
+import pandas as pd
+from src.analysis.duplicates import CATEGORY_COLUMNS, FLAG_COLUMNS, DuplicateDetector
+
+
+def _listings(areas, prices, ids):
+    n = len(areas)
+    frame = pd.DataFrame(
+        {
+            "id": ids,
+            "district": ["Wola"] * n,
+            "neighborhood": ["Mirów"] * n,
+            "street": ["ul. Grzybowska"] * n,
+            "rooms": [2] * n,
+            "area": areas,
+            "price": prices,
+        }
+    )
+    for col in CATEGORY_COLUMNS:
+        frame[col] = "x"
+    for col in FLAG_COLUMNS:
+        frame[col] = True
+    return frame
+
+
+def test_small_area_differences_across_bucket_edges_are_merged():
+    frame = _listings([52.4, 52.6, 52.3], [700_000, 703_000, 701_000], ["c", "a", "b"])
+    assert DuplicateDetector().assign_clusters(frame)["cluster_id"].tolist() == ["a"] * 3
+
+
+def test_area_beyond_max_diff_is_not_merged():
+    frame = _listings([52.4, 54.0], [700_000, 700_000], ["a", "b"])
+    assert DuplicateDetector().assign_clusters(frame)["cluster_id"].tolist() == ["a", "b"]
+
+
+def test_repeated_ids_keep_id_keys_independent_of_row_order():
+    frame = _listings([40.0, 80.0, 52.4], [400_000, 900_000, 700_000], ["7", "7", "9"])
+    clusters = DuplicateDetector().assign_clusters(frame)["cluster_id"]
+    reversed_clusters = DuplicateDetector().assign_clusters(frame.iloc[::-1])["cluster_id"]
+
+    assert clusters.nunique() == 3
+    assert set(clusters) == {"7", "7-1", "9"}
+    assert clusters.equals(reversed_clusters.loc[clusters.index])
@@ -0,0 +1,15 @@
+from src.scraper.listing_index import ListingIndex
+
+
+def _links(*numbers):
+    return [f"https://www.otodom.pl/pl/oferta/m-ID{n}" for n in numbers]
+
+
+def test_filter_new_claims_only_up_to_limit():
+    index = ListingIndex()
+    index.filter_new(_links(1))
+
+    assert index.filter_new(_links(1, 2, 3, 4), limit=2) == _links(2, 3)
+    # Links past the cap were not claimed and are still new elsewhere
+    assert index.filter_new(_links(3, 4)) == _links(4)
+    assert len(index) == 4
@@ -0,0 +1,118 @@
+import pandas as pd
+from src.cleaner.property_cleaner import PropertyDataCleaner
+from src.cleaner.quality_rules import (
+    REASON_COLUMN,
+    ConsistencyRule,
+    DataQualityChecker,
+    GroupOutlierRule,
+    RangeRule,
+)
+from src.models.property import Property
+from src.models.property_batch import PropertyBatch
+from src.models.types import ListingType
+
+
+class _RejectAbove:
+    """Quality checker quarantining listings priced above a threshold"""
+
+    def __init__(self, max_price):
+        self.max_price = max_price
+
+    def split(self, df):
+        failed = df["price"] > self.max_price
+        return df[~failed], df[failed]
+
+
+def _raw_csv(path):
+    properties = [
+        Property(
+            link=f"https://www.otodom.pl/pl/oferta/m-ID{i}",
+            price=price,
+            location="ul. Lazurowa, Chrzanów, Bemowo, Warszawa, mazowieckie",
+            area="40m²",
+        )
+        for i, price in enumerate([3000, 3500, 90_000])
+    ]
+    PropertyBatch(properties).to_dataframe().to_csv(path, index=False)
+
+
+def test_stale_quarantine_file_is_removed(tmp_path):
+    cleaner = PropertyDataCleaner()
+    raw_path = tmp_path / "bemowo_rents.csv"
+    quarantine_path = tmp_path / "quarantine" / "bemowo_rents.csv"
+    _raw_csv(raw_path)
+
+    cleaner.clean_single_file(
+        raw_path, tmp_path / "clean.csv", _RejectAbove(10_000), quarantine_path
+    )
+    assert len(pd.read_csv(quarantine_path)) == 1
+
+    cleaner.clean_single_file(
+        raw_path, tmp_path / "clean.csv", _RejectAbove(100_000), quarantine_path
+    )
+    assert not quarantine_path.exists()
+    assert len(pd.read_csv(tmp_path / "clean.csv")) == 3
+
+
+def _sales(n=12):
+    return pd.DataFrame(
+        {
+            "district": ["wola"] * n,
+            "price": [15_000 * (40 + i) + 1_000 * i for i in range(n)],
+            "area": [40.0 + i for i in range(n)],
+            "current_floor": pd.array([2] * n, dtype="Int64"),
+            "total_floors": pd.array([5] * n, dtype="Int64"),
+            "maintenance_fee": pd.array([500] * n, dtype="Int64"),
+        }
+    )
+
+
+def test_range_rule_allowed_values_pass():
+    fees = pd.Series([0, 1, 19, 20, 500, None], dtype="Int64")
+    rule = RangeRule("maintenance_fee", 20, 10_000, allowed_values=(0,))
+
+    violations = rule.violations({"maintenance_fee": fees})
+    assert violations.tolist() == [False, True, True, False, False, False]
+
+
+def test_consistency_rule_flags_floor_above_total():
+    df = pd.DataFrame(
+        {
+            "current_floor": pd.array([3, 7, 5, None], dtype="Int64"),
+            "total_floors": pd.array([5, 5, 5, 5], dtype="Int64"),
+        }
+    )
+    rule = ConsistencyRule("current_floor", "total_floors")
+
+    assert rule.name == "current_floor_above_total_floors"
+    assert rule.violations(dict(df.items())).tolist() == [False, True, False, False]
+
+
+def test_group_outlier_rule_needs_a_large_enough_group():
+    df = _sales()
+    df.loc[0, "price"] = 60_000 * df.loc[0, "area"]
+    checker = DataQualityChecker([GroupOutlierRule("price_per_m2")])
+
+    outliers = checker.evaluate(df)["price_per_m2_district_outlier"]
+    assert outliers.tolist() == [True] + [False] * 11
+    assert not checker.evaluate(df.head(5)).to_numpy().any()
+
+
+def test_split_lists_every_failed_rule():
+    df = _sales()
+    df.loc[1, "current_floor"] = 6
+    df.loc[2, "maintenance_fee"] = 1
+    df.loc[3, "maintenance_fee"] = 0
+    df.loc[4, ["current_floor", "maintenance_fee"]] = [9, 1]
+    df.loc[5, "price"] = 60_000 * df.loc[5, "area"]
+
+    passed, quarantined = DataQualityChecker.for_listing_type(ListingType.SALE).split(df)
+
+    assert quarantined[REASON_COLUMN].to_dict() == {
+        1: "current_floor_above_total_floors",
+        2: "maintenance_fee_out_of_range",
+        4: "maintenance_fee_out_of_range; current_floor_above_total_floors",
+        5: "price_per_m2_district_outlier",
+    }
+    assert passed.index.tolist() == [0, 3, 6, 7, 8, 9, 10, 11]
+    assert REASON_COLUMN not in passed.columns
@@ -0,0 +1,45 @@
+import pandas as pd
+from src.history.snapshot_store import SnapshotStore
+from src.models.property import Property
+from src.models.property_batch import PropertyBatch
+
+
+def _snapshot(prices):
+    properties = [
+        Property(link=f"https://www.otodom.pl/pl/oferta/m-ID{i}", price=price, area="40m²")
+        for i, price in enumerate(prices)
+    ]
+    return PropertyBatch(properties).to_dataframe()
+
+
+def test_missing_price_does_not_fake_changes(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    prices = [100_000, 200_000, 300_000, 400_000, 500_000]
+
+    first = _snapshot(prices)
+    second = _snapshot(prices + [None])
+    assert first["price"].dtype == "int64"
+    assert second["price"].dtype == "float64"
+
+    store.record(first, taken_at="2025-01-01T00:00:00")
+    entry = store.record(second, taken_at="2025-01-02T00:00:00")
+
+    assert (entry["added"], entry["changed"], entry["removed"]) == (1, 0, 0)
+    history = store.price_history("0")
+    assert history["_op"].tolist() == ["added"]
+    assert history["price"].tolist() == [100_000]
+
+
+def test_price_change_is_recorded(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.record(_snapshot([100_000, None]), taken_at="2025-01-01T00:00:00")
+    entry = store.record(_snapshot([90_000, None]), taken_at="2025-01-02T00:00:00")
+
+    assert entry["changed"] == 1
+    assert store.price_history("0")["price"].tolist() == [100_000, 90_000]
+    assert store.listing_history("0")["price"].tolist() == [100_000, 90_000]
+
+    state = store.state_as_of("2025-01-01T12:00:00").set_index("id")
+    assert state["price"].dtype == "Int64"
+    assert state.loc["0", "price"] == 100_000
+    assert pd.isna(state.loc["1", "price"])
@@ -0,0 +1,37 @@
+import logging
+import pandas as pd
+from src.geo.spatial_index import SpatialIndex
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "lat": [52.2300, 52.2301, 52.2302, None],
+            "lon": [21.0100, 21.0101, 21.0102, None],
+            "geo_precision": ["street", "neighborhood", "district", None],
+        }
+    )
+
+
+def test_results_expose_and_filter_precision():
+    index = SpatialIndex.from_frame(_frame())
+
+    positions, _ = index.query_radius(52.23, 21.01, 100, sort=True)
+    assert positions.tolist() == [0, 1, 2]
+    assert index.precision_of(positions).tolist() == ["street", "neighborhood", "district"]
+
+    positions, _ = index.query_radius(52.23, 21.01, 100, max_precision="neighborhood")
+    assert sorted(positions.tolist()) == [0, 1]
+
+    positions, _ = index.query_knn(52.23, 21.01, 3, max_precision="street")
+    assert positions.tolist() == [0]
+
+
+def test_warns_when_results_are_coarser_than_radius(caplog):
+    index = SpatialIndex.from_frame(_frame())
+
+    with caplog.at_level(logging.WARNING, logger="src.geo.spatial_index"):
+        index.query_radius(52.23, 21.01, 5000, max_precision="district")
+        assert not caplog.records
+        index.query_radius(52.23, 21.01, 100)
+    assert "district precision" in caplog.text
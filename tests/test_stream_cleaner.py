@@ -0,0 +1,33 @@
+import pandas as pd
+from src.cleaner.property_cleaner import PropertyDataCleaner
+from src.cleaner.stream_cleaner import StreamingCleaner
+from src.models.property import Property
+from src.models.types import District, ListingType
+
+
+def _properties(count):
+    return [
+        Property(
+            link=f"https://www.otodom.pl/pl/oferta/m-ID{i}",
+            price=3000 + i,
+            location="ul. Lazurowa, Chrzanów, Bemowo, Warszawa, mazowieckie",
+            area="40m²",
+        )
+        for i in range(count)
+    ]
+
+
+def test_run_replaces_files_of_an_earlier_run(tmp_path):
+    cleaner = StreamingCleaner(PropertyDataCleaner(), clean_dir=str(tmp_path / "clean"))
+    scraped = cleaner.output_path(District.BEMOWO, ListingType.RENT)
+    not_scraped = cleaner.output_path(District.WOLA, ListingType.RENT)
+    for path in (scraped, not_scraped):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({"price": [1, 2, 3, 4, 5]}).to_csv(path, index=False)
+
+    with cleaner:
+        cleaner.add(_properties(2), District.BEMOWO, ListingType.RENT)
+
+    assert scraped == tmp_path / "clean" / "rents" / "bemowo_rents.csv"
+    assert len(pd.read_csv(scraped)) == 2
+    assert not not_scraped.exists()